@@ -0,0 +1,99 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Hashable, Iterable, Optional, Union
+
+from homework import InfoMessage
+
+DAY: str = 'day'
+WEEK: str = 'week'
+PERIODS: tuple[str, ...] = (DAY, WEEK)
+
+RollupKey = tuple[str, date, Hashable, str]
+
+
+@dataclass
+class Rollup:
+    """Накопленные итоги группы тренировок."""
+    sessions: int = 0
+    duration: float = 0.0
+    distance: float = 0.0
+    calories: float = 0.0
+    speed_hours: float = 0.0  # Sum of speed * duration
+
+    def add(self, info: InfoMessage) -> None:
+        """Учесть одну тренировку."""
+        self.sessions += 1
+        self.duration += info.duration
+        self.distance += info.distance
+        self.calories += info.calories
+        self.speed_hours += info.speed * info.duration
+
+    def merge(self, other: 'Rollup') -> None:
+        """Прибавить итоги, посчитанные отдельно."""
+        self.sessions += other.sessions
+        self.duration += other.duration
+        self.distance += other.distance
+        self.calories += other.calories
+        self.speed_hours += other.speed_hours
+
+    @property
+    def mean_speed(self) -> float:
+        """Средняя скорость, взвешенная по длительности тренировок."""
+        if not self.duration:
+            return 0.0
+        return self.speed_hours / self.duration
+
+
+def period_start(period: str, day: Union[date, datetime]) -> date:
+    """Вернуть первый день периода, в который попадает дата."""
+    if isinstance(day, datetime):
+        day = day.date()
+    if period == DAY:
+        return day
+    if period == WEEK:
+        return day - timedelta(days=day.weekday())
+    raise ValueError(f'Неизвестный период: {period}')
+
+
+class Aggregator:
+    """Итоги по пользователям и видам тренировок за дни и недели."""
+
+    def __init__(self) -> None:
+        self.rollups: defaultdict[RollupKey, Rollup] = defaultdict(Rollup)
+        self.training_types: set[str] = set()
+
+    def add(self, user_id: Hashable, moment: Union[date, datetime],
+            info: InfoMessage) -> None:
+        """Учесть тренировку во всех периодах за O(1)."""
+        self.training_types.add(info.training_type)
+        for period in PERIODS:
+            key = (period, period_start(period, moment), user_id,
+                   info.training_type)
+            self.rollups[key].add(info)
+
+    def extend(self, events: Iterable[tuple[Hashable, Union[date, datetime],
+                                            InfoMessage]]) -> None:
+        """Учесть поток событий (пользователь, время, сообщение)."""
+        for user_id, moment, info in events:
+            self.add(user_id, moment, info)
+
+    def merge(self, other: 'Aggregator') -> None:
+        """Прибавить итоги другого обработчика или шарда."""
+        for key, rollup in other.rollups.items():
+            self.rollups[key].merge(rollup)
+        self.training_types |= other.training_types
+
+    def get(self, period: str, moment: Union[date, datetime],
+            user_id: Hashable,
+            training_type: Optional[str] = None) -> Rollup:
+        """Вернуть итоги периода; без вида тренировки — по всем видам."""
+        start = period_start(period, moment)
+        types = (self.training_types if training_type is None
+                 else (training_type,))
+        total = Rollup()
+        for name in types:
+            rollup = self.rollups.get((period, start, user_id, name))
+            if rollup is not None:
+                total.merge(rollup)
+        return total
@@ -0,0 +1,63 @@
+import argparse
+import gzip
+import json
+import os
+import tempfile
+import time
+
+from packets import make_packets
+
+from compressed import iter_decompressed, read_compressed, write_compressed
+from stream import read_jsonl
+
+
+def naive(path: str) -> int:
+    with gzip.open(path, 'rt', encoding='utf-8') as source:
+        return sum(1 for _ in read_jsonl(source))
+
+
+def chunked(path: str, workers: int) -> int:
+    return sum(len(chunk) for chunk in read_compressed(path,
+                                                       workers=workers))
+
+
+def naive_bytes(path: str) -> int:
+    with gzip.open(path, 'rb') as source:
+        return sum(len(line) for line in source)
+
+
+def chunked_bytes(path: str, workers: int) -> int:
+    return sum(len(block) for block in iter_decompressed(path, workers))
+
+
+def measure(name: str, func, *args, unit: str = 'пакетов/с',
+            scale: float = 1) -> None:
+    start = time.perf_counter()
+    count = func(*args)
+    elapsed = time.perf_counter() - start
+    print(f'{name:<28} {count / elapsed / scale:>12,.0f} {unit}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Чтение сжатых пакетов: gzip.open против пула.')
+    parser.add_argument('--size', type=int, default=1_000_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    args = parser.parse_args()
+    lines = [json.dumps(packet) + '\n' for packet in make_packets(args.size)]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'packets.jsonl.gz')
+        write_compressed(path, lines)
+        print(f'Ядер: {os.cpu_count()}, '
+              f'файл {os.path.getsize(path) / 2**20:.1f} МБ')
+        print('Только распаковка:')
+        measure('gzip.open, по строкам', naive_bytes, path, unit='МБ/с',
+                scale=2**20)
+        for workers in args.workers:
+            measure(f'iter_decompressed, {workers} пот.', chunked_bytes,
+                    path, workers, unit='МБ/с', scale=2**20)
+        print('Распаковка и разбор JSON:')
+        measure('gzip.open, по строкам', naive, path)
+        for workers in args.workers:
+            measure(f'read_compressed, {workers} пот.', chunked, path,
+                    workers)
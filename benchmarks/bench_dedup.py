@@ -0,0 +1,36 @@
+import argparse
+import time
+
+from packets import make_packets
+
+from dedup import CAPACITY, MEMORY_BUDGET, DuplicateFilter, packet_key
+
+
+def keys(count: int, device: str, seed: int):
+    return [packet_key(f'{device}-{number % 1000}', number, *packet)
+            for number, packet in enumerate(make_packets(count, seed))]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Скорость и ложные срабатывания фильтра повторов.')
+    parser.add_argument('--size', type=int, default=2_000_000,
+                        help='пакетов в поколении')
+    parser.add_argument('--probes', type=int, default=200_000)
+    args = parser.parse_args()
+    # Memory is scaled with the sample to keep the designed bits per packet.
+    memory = MEMORY_BUDGET * args.size // CAPACITY
+    dedup = DuplicateFilter(memory=memory, capacity=args.size)
+    added = keys(args.size, 'watch', seed=1)
+    start = time.perf_counter()
+    for key in added:
+        dedup.seen(key)
+    elapsed = time.perf_counter() - start
+    estimate = dedup.false_positive_rate()
+    probes = keys(args.probes, 'band', seed=2)
+    measured = sum(map(dedup.seen, probes)) / len(probes)
+    print(f'Память: {dedup.memory / 2**20:.1f} МБ, '
+          f'хешей: {dedup.hashes}, '
+          f'{elapsed / args.size * 1e6:.2f} мкс на пакет')
+    print(f'Ложные срабатывания: измерено {measured:.4%}, '
+          f'оценка {estimate:.4%}')
@@ -0,0 +1,43 @@
+import argparse
+import gc
+import tracemalloc
+
+from packets import make_packets
+
+import compact
+import homework
+
+
+def measure(name: str, build, packets, scale: int) -> None:
+    gc.collect()
+    tracemalloc.start()
+    result = build(packets)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    print(f'{name:<28} {size * scale / len(packets) / 2**20:>8.1f} МБ')
+
+
+def trainings(module):
+    return lambda packets: [module.read_package(*packet)
+                            for packet in packets]
+
+
+def messages(module):
+    return lambda packets: [module.InfoMessage('Running', *data[:3], 0.0)
+                            for _, data in packets]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Память на 1 млн тренировок (по выборке).')
+    parser.add_argument('--size', type=int, default=200_000)
+    args = parser.parse_args()
+    packets = make_packets(args.size)
+    scale = 1_000_000
+    print('Память в пересчёте на 1 млн тренировок:')
+    measure('homework.Training', trainings(homework), packets, scale)
+    measure('compact.Training', trainings(compact), packets, scale)
+    measure('homework.InfoMessage', messages(homework), packets, scale)
+    measure('compact.InfoMessage', messages(compact), packets, scale)
+    measure('compact.TrainingBatch', compact.TrainingBatch, packets, scale)
@@ -0,0 +1,45 @@
+import argparse
+import os
+import time
+
+from packets import make_packets
+
+from homework import read_package
+from parallel import process_parallel
+
+
+def sequential(packets) -> int:
+    count = 0
+    for workout_type, data in packets:
+        read_package(workout_type, data).show_training_info().get_message()
+        count += 1
+    return count
+
+
+def parallel(packets, workers: int, chunk_size: int) -> int:
+    count = 0
+    for info in process_parallel(packets, workers, chunk_size):
+        info.get_message()
+        count += 1
+    return count
+
+
+def measure(name: str, func, *args) -> None:
+    start = time.perf_counter()
+    count = func(*args)
+    elapsed = time.perf_counter() - start
+    print(f'{name:<16} {count / elapsed:>12,.0f} пакетов/с')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Масштабирование обработки пакетов по ядрам.')
+    parser.add_argument('--size', type=int, default=200_000)
+    parser.add_argument('--chunk-size', type=int, default=2000)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+    packets = make_packets(args.size)
+    measure('sequential', sequential, packets)
+    for workers in range(1, args.max_workers + 1):
+        measure(f'workers={workers}', parallel, packets, workers,
+                args.chunk_size)
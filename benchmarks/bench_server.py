@@ -0,0 +1,63 @@
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from packets import make_packets
+
+from server import PacketServer
+
+
+async def client(host: str, port: int, packets: list,
+                 window: int, latencies: list) -> None:
+    """Отправлять пакеты, держа в полёте не больше window штук."""
+    reader, writer = await asyncio.open_connection(host, port)
+    sent = []
+    lines = [json.dumps(packet).encode() + b'\n' for packet in packets]
+
+    async def receive() -> None:
+        for _ in lines:
+            await reader.readline()
+            latencies.append(time.perf_counter() - sent.pop(0))
+
+    receiver = asyncio.create_task(receive())
+    for start in range(0, len(lines), window):
+        chunk = lines[start:start + window]
+        sent.extend([time.perf_counter()] * len(chunk))
+        writer.writelines(chunk)
+        await writer.drain()
+        while len(sent) > window:
+            await asyncio.sleep(0)
+    await receiver
+    writer.close()
+    await writer.wait_closed()
+
+
+async def run(clients: int, size: int, window: int) -> None:
+    server = PacketServer()
+    listener = await server.start('127.0.0.1', 0)
+    host, port = listener.sockets[0].getsockname()[:2]
+    packets = make_packets(size)
+    latencies: list[float] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, packets, window, latencies)
+                           for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+    await server.close()
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f'клиентов: {clients}, пакетов: {len(latencies)}')
+    print(f'пропускная способность: {len(latencies) / elapsed:,.0f} '
+          'пакетов/с')
+    for name, index in (('p50', 49), ('p95', 94), ('p99', 98)):
+        print(f'{name}: {quantiles[index] * 1000:.2f} мс')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Нагрузочный клиент для server.PacketServer.')
+    parser.add_argument('--clients', type=int, default=20)
+    parser.add_argument('--size', type=int, default=5000)
+    parser.add_argument('--window', type=int, default=64)
+    args = parser.parse_args()
+    asyncio.run(run(args.clients, args.size, args.window))
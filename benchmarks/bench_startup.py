@@ -0,0 +1,68 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
+
+PLUGIN = '''import math
+
+from homework import Training
+
+TABLE = [math.sin(index / 1000) for index in range({work})]
+
+
+class Plugin{index}(Training):
+    """Тренировка из плагина {index}."""
+
+    def get_spent_calories(self):
+        return self.weight * self.duration * {index}
+
+
+TRAINING = Plugin{index}
+'''
+
+SCENARIOS = {
+    'без плагинов': "import homework",
+    'ленивая, встроенный тип': (
+        "import homework; homework.read_package('RUN', [15000, 1, 75])"),
+    'ленивая, один плагин': (
+        "import homework; homework.read_package('P000', [15000, 1, 75])"),
+    'все плагины сразу': "import homework; homework.CLASSES.load_all()",
+}
+
+
+def make_plugins(directory: str, count: int, work: int) -> None:
+    for index in range(count):
+        path = Path(directory, f'p{index:03}.py')
+        path.write_text(PLUGIN.format(index=index, work=work))
+
+
+def run(code: str, plugin_dir: str, repeats: int) -> float:
+    env = dict(os.environ, TRAINING_PLUGIN_PATH=plugin_dir,
+               PYTHONPATH=str(BASE_DIR), PYTHONDONTWRITEBYTECODE='1')
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], env=env, check=True)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Время запуска с ленивой и жадной загрузкой плагинов.')
+    parser.add_argument('--plugins', type=int, default=50)
+    parser.add_argument('--work', type=int, default=20000,
+                        help='объём работы при импорте одного плагина')
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as plugin_dir:
+        make_plugins(plugin_dir, args.plugins, args.work)
+        for name, code in SCENARIOS.items():
+            elapsed = run(code, plugin_dir, args.repeats)
+            print(f'{name:<26} {elapsed * 1000:>8.1f} мс')
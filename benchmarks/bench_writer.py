@@ -0,0 +1,84 @@
+import argparse
+import functools
+import io
+import statistics
+import time
+
+from packets import make_packets
+
+from homework import RENDER_CHUNK, read_package
+from writer import QUEUE_SIZE, BackgroundWriter
+
+
+class SlowOutput(io.TextIOBase):
+    """Вывод с ограниченной пропускной способностью, как медленный pipe."""
+
+    def __init__(self, bandwidth: float, write_cost: float) -> None:
+        self.bandwidth = bandwidth
+        self.write_cost = write_cost
+        self.written_at: list[float] = []
+        self._debt = 0.0
+
+    def write(self, text: str) -> int:
+        self._debt += self.write_cost + len(text) / self.bandwidth
+        if self._debt >= 0.001:  # Sleeps shorter than 1 ms are too coarse
+            time.sleep(self._debt)
+            self._debt = 0.0
+        self.written_at.append(time.perf_counter())
+        return len(text)
+
+
+def print_loop(packets, output: SlowOutput) -> list[float]:
+    latencies = []
+    for workout_type, data in packets:
+        info = read_package(workout_type, data).show_training_info()
+        computed = time.perf_counter()
+        print(info.get_message(), file=output)
+        latencies.append(output.written_at[-1] - computed)
+    return latencies
+
+
+def background(packets, output: SlowOutput,
+               queue_size: int = QUEUE_SIZE) -> list[float]:
+    computed = []
+    with BackgroundWriter(output, queue_size) as writer:
+        for start in range(0, len(packets), RENDER_CHUNK):
+            batch = [read_package(workout_type, data).show_training_info()
+                     for workout_type, data
+                     in packets[start:start + RENDER_CHUNK]]
+            computed.append(time.perf_counter())
+            writer.put(batch)
+    # The writer makes one write per batch, counted from the batch ready.
+    return [written - ready
+            for ready, written in zip(computed, output.written_at)]
+
+
+def measure(name: str, func, packets, bandwidth, write_cost) -> None:
+    output = SlowOutput(bandwidth, write_cost)
+    start = time.perf_counter()
+    latencies = func(packets, output)
+    elapsed = time.perf_counter() - start
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f'{name:<20} {len(packets) / elapsed:>10,.0f} пакетов/с  '
+          f'задержка p50 {quantiles[49] * 1e3:7.2f} мс, '
+          f'p99 {quantiles[98] * 1e3:7.2f} мс')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='print на каждую тренировку против фонового вывода.')
+    parser.add_argument('--size', type=int, default=100_000)
+    parser.add_argument('--bandwidth', type=float, default=10e6,
+                        help='пропускная способность вывода, символов/с')
+    parser.add_argument('--queue-size', type=int, nargs='+',
+                        default=[QUEUE_SIZE, 2],
+                        help='размеры очереди фонового вывода')
+    parser.add_argument('--write-cost', type=float, default=5e-6,
+                        help='цена одного вызова write, с')
+    args = parser.parse_args()
+    packets = make_packets(args.size)
+    measure('print', print_loop, packets, args.bandwidth, args.write_cost)
+    for queue_size in args.queue_size:
+        measure(f'очередь {queue_size}',
+                functools.partial(background, queue_size=queue_size),
+                packets, args.bandwidth, args.write_cost)
@@ -0,0 +1,26 @@
+import random
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
+sys.path.append(str(BASE_DIR))
+
+
+def make_packets(size: int, seed: int = 0) -> list[tuple[str, list]]:
+    """Сгенерировать воспроизводимый набор пакетов SWM/RUN/WLK."""
+    # Imported here: the project root is on sys.path only after the setup
+    # above, and the tests share this generator through conftest.
+    from batch import TYPE_CODES
+
+    rnd = random.Random(seed)
+    packets = []
+    for _ in range(size):
+        workout_type = rnd.choice(TYPE_CODES)
+        data = [rnd.randint(100, 30000), round(rnd.uniform(0.1, 5), 3),
+                round(rnd.uniform(40, 120), 1)]
+        if workout_type == 'WLK':
+            data.append(rnd.randint(140, 210))
+        elif workout_type == 'SWM':
+            data += [rnd.choice((25, 50)), rnd.randint(1, 80)]
+        packets.append((workout_type, data))
+    return packets
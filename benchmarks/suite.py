@@ -0,0 +1,135 @@
+import argparse
+import json
+import platform
+import sys
+import time
+from typing import Callable
+
+from packets import make_packets
+
+from dispatch import compute_package
+from homework import read_package
+
+SIZES: tuple[int, ...] = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+REPEATS: int = 3  # Best of several runs is reported
+THRESHOLD: float = 0.1  # Allowed throughput drop against the baseline
+
+
+def trainings(packets) -> list:
+    return [read_package(workout_type, data)
+            for workout_type, data in packets]
+
+
+def messages(packets) -> list:
+    return [training.show_training_info() for training in trainings(packets)]
+
+
+def bench_read_package(packets) -> None:
+    for workout_type, data in packets:
+        read_package(workout_type, data)
+
+
+def bench_get_spent_calories(items) -> None:
+    for training in items:
+        training.get_spent_calories()
+
+
+def bench_show_training_info(items) -> None:
+    for training in items:
+        training.show_training_info()
+
+
+def bench_get_message(items) -> None:
+    for info in items:
+        info.get_message()
+
+
+def bench_end_to_end(packets) -> None:
+    for workout_type, data in packets:
+        read_package(workout_type, data).show_training_info().get_message()
+
+
+def bench_compute_package(packets) -> None:
+    for workout_type, data in packets:
+        compute_package(workout_type, data).get_message()
+
+
+def only(workout_type: str) -> Callable:
+    return lambda packets: trainings(
+        packet for packet in packets if packet[0] == workout_type)
+
+
+# Name: (prepare input outside of the timer, timed function)
+BENCHMARKS: dict[str, tuple[Callable, Callable]] = {
+    'read_package': (list, bench_read_package),
+    'get_spent_calories[SWM]': (only('SWM'), bench_get_spent_calories),
+    'get_spent_calories[RUN]': (only('RUN'), bench_get_spent_calories),
+    'get_spent_calories[WLK]': (only('WLK'), bench_get_spent_calories),
+    'show_training_info': (trainings, bench_show_training_info),
+    'get_message': (messages, bench_get_message),
+    'end_to_end': (list, bench_end_to_end),
+    'compute_package': (list, bench_compute_package),
+}
+
+
+def measure(name: str, packets, repeats: int = REPEATS) -> float:
+    """Вернуть лучшую пропускную способность в элементах в секунду."""
+    prepare, bench = BENCHMARKS[name]
+    best = float('inf')
+    for _ in range(repeats):
+        items = prepare(packets)  # Fresh objects for every repeat
+        start = time.perf_counter()
+        bench(items)
+        best = min(best, time.perf_counter() - start)
+    return len(items) / best
+
+
+def run(sizes, names, repeats: int) -> dict:
+    """Прогнать выбранные замеры на всех размерах."""
+    results = {}
+    for size in sizes:
+        packets = make_packets(size)
+        for name in names:
+            results[f'{name}@{size}'] = measure(name, packets, repeats)
+    return {'python': platform.python_version(),
+            'machine': platform.machine(),
+            'results': results}
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Вернуть замеры, просевшие сильнее допустимого порога."""
+    regressions = []
+    for key, value in current['results'].items():
+        reference = baseline['results'].get(key)
+        if reference and value < reference * (1 - threshold):
+            regressions.append(f'{key}: {value:,.0f} < {reference:,.0f} '
+                               f'пакетов/с ({value / reference - 1:+.1%})')
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Замеры скорости горячих путей homework.py.')
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=list(SIZES[:3]),
+                        help=f'размеры наборов, например {SIZES}')
+    parser.add_argument('--bench', nargs='+', choices=list(BENCHMARKS),
+                        default=list(BENCHMARKS))
+    parser.add_argument('--repeats', type=int, default=REPEATS)
+    parser.add_argument('--output', help='куда сохранить результаты JSON')
+    parser.add_argument('--baseline', help='JSON с эталонными результатами')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD)
+    args = parser.parse_args()
+    current = run(args.sizes, args.bench, args.repeats)
+    text = json.dumps(current, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w') as output:
+            output.write(text + '\n')
+    else:
+        print(text)
+    if args.baseline:
+        with open(args.baseline) as source:
+            regressions = compare(current, json.load(source), args.threshold)
+        for line in regressions:
+            print('Регрессия:', line, file=sys.stderr)
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,100 @@
+import mmap
+import struct
+from contextlib import contextmanager
+from typing import BinaryIO, Iterable, Iterator
+
+import numpy as np
+
+from batch import (FIELD_NAMES, TYPE_CODES, TYPE_NUMBERS, BatchMetrics,
+                   compute_batch, field_names)
+from stream import Packet
+
+MAGIC: bytes = b'TRK1'  # File header, also the format version
+FIELDS_COUNT: int = 5  # Numeric fields of the longest packet (SWM)
+RECORD = struct.Struct('<B5d')  # Type code and numeric fields
+READ_RECORDS: int = 65536  # Records read from a stream at once
+RECORD_DTYPE = np.dtype([('type_code', 'u1')]
+                        + [(f'f{index}', '<f8')
+                           for index in range(FIELDS_COUNT)])
+
+ARITY: dict[str, int] = {code: len(names)
+                         for code, names in FIELD_NAMES.items()}
+
+
+def write_packets(output: BinaryIO, packets: Iterable[Packet]) -> int:
+    """Записать пакеты в двоичном формате, вернуть их количество."""
+    padding = (0.0,) * FIELDS_COUNT
+    output.write(MAGIC)
+    count = 0
+    for workout_type, data in packets:
+        arity = len(field_names(workout_type))
+        if len(data) != arity:
+            raise TypeError(f'{workout_type} ожидает {arity} '
+                            f'аргументов, получено {len(data)}')
+        output.write(RECORD.pack(TYPE_NUMBERS[workout_type],
+                                 *data, *padding[len(data):]))
+        count += 1
+    return count
+
+
+def _records(buffer) -> memoryview:
+    view = memoryview(buffer)
+    if view[:len(MAGIC)] != MAGIC:
+        raise ValueError('Неизвестный формат файла пакетов.')
+    records = view[len(MAGIC):]
+    if len(records) % RECORD.size:
+        raise ValueError('Файл пакетов обрезан.')
+    return records
+
+
+def _decode(records) -> Iterator[tuple[str, tuple]]:
+    ends = [ARITY[code] + 1 for code in TYPE_CODES]
+    for record in RECORD.iter_unpack(records):
+        number = record[0]
+        if number >= len(TYPE_CODES):
+            raise NotImplementedError('Получены неверные данные!')
+        yield TYPE_CODES[number], record[1:ends[number]]
+
+
+def iter_packets(buffer) -> Iterator[tuple[str, tuple]]:
+    """Построчно декодировать пакеты для read_package."""
+    return _decode(_records(buffer))
+
+
+def read_stream(source: BinaryIO,
+                records: int = READ_RECORDS) -> Iterator[tuple[str, tuple]]:
+    """Декодировать пакеты из потока, читая по records записей."""
+    if source.read(len(MAGIC)) != MAGIC:
+        raise ValueError('Неизвестный формат файла пакетов.')
+    while block := source.read(RECORD.size * records):
+        # A short read from a pipe is completed up to whole records.
+        while len(block) % RECORD.size:
+            more = source.read(RECORD.size - len(block) % RECORD.size)
+            if not more:
+                raise ValueError('Файл пакетов обрезан.')
+            block += more
+        yield from _decode(block)
+
+
+def read_records(buffer) -> np.ndarray:
+    """Представить пакеты структурированным массивом без копирования."""
+    return np.frombuffer(_records(buffer), dtype=RECORD_DTYPE)
+
+
+def compute_records(records: np.ndarray,
+                    dtype=np.float64) -> BatchMetrics:
+    """Рассчитать показатели по структурированному массиву пакетов."""
+    # The 4th field is height for WLK and length_pool for SWM; each batch
+    # kernel only reads the rows of its own type.
+    return compute_batch(records['type_code'], records['f0'],
+                         records['f1'], records['f2'], height=records['f3'],
+                         length_pool=records['f3'], count_pool=records['f4'],
+                         dtype=dtype)
+
+
+@contextmanager
+def map_file(path: str) -> Iterator[mmap.mmap]:
+    """Отобразить файл пакетов в память только для чтения."""
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0,
+                                             access=mmap.ACCESS_READ) as data:
+        yield data
@@ -0,0 +1,137 @@
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from itertools import islice
+from typing import Optional
+
+from aggregation import Rollup
+from homework import render_messages
+from stream import (READERS, ErrorSink, decode_lines, process_pairs,
+                    route_error)
+
+CHECKPOINT_EVERY: int = 50_000  # Input lines between checkpoints
+VERSION: int = 1  # Checkpoint file format
+
+
+@dataclass
+class Checkpoint:
+    """Состояние задачи: позиции во входе и выходе и итоги по видам."""
+    input_path: str
+    output_path: str
+    input_offset: int = 0
+    output_position: int = 0
+    packets: int = 0
+    errors: int = 0
+    totals: dict[str, Rollup] = field(default_factory=dict)
+
+    def to_json(self) -> str:
+        return json.dumps({'version': VERSION, **asdict(self)})
+
+    @classmethod
+    def from_json(cls, text: str) -> 'Checkpoint':
+        state = json.loads(text)
+        if state.pop('version', None) != VERSION:
+            raise ValueError('Неизвестная версия контрольной точки.')
+        state['totals'] = {name: Rollup(**rollup)
+                           for name, rollup in state['totals'].items()}
+        return cls(**state)
+
+
+def save_checkpoint(path: str, checkpoint: Checkpoint) -> None:
+    """Атомарно записать контрольную точку: временный файл и rename."""
+    temporary = f'{path}.tmp'
+    with open(temporary, 'w', encoding='utf-8') as output:
+        output.write(checkpoint.to_json())
+        output.flush()
+        os.fsync(output.fileno())
+    os.replace(temporary, path)
+
+
+def load_checkpoint(path: str) -> Optional[Checkpoint]:
+    """Прочитать контрольную точку или None, если её ещё нет."""
+    try:
+        with open(path, encoding='utf-8') as source:
+            return Checkpoint.from_json(source.read())
+    except FileNotFoundError:
+        return None
+
+
+class CheckpointedJob:
+    """Пакетная обработка файла, продолжаемая после сбоя.
+
+    Выход дописывается только до позиции из последней контрольной точки:
+    при перезапуске всё, что было записано после неё, отрезается и
+    рассчитывается заново, поэтому каждое сообщение попадает в выход
+    ровно один раз.
+    """
+
+    def __init__(self, input_path: str, output_path: str,
+                 checkpoint_path: str, fmt: str = 'jsonl',
+                 every: int = CHECKPOINT_EVERY,
+                 errors: Optional[ErrorSink] = None) -> None:
+        if fmt not in READERS:
+            raise NotImplementedError(f'Неизвестный формат: {fmt}')
+        self.input_path = input_path
+        self.output_path = output_path
+        self.checkpoint_path = checkpoint_path
+        self.fmt = fmt
+        self.every = every
+        self.errors = errors
+
+    def restore(self) -> Checkpoint:
+        """Загрузить контрольную точку этой задачи или начать заново."""
+        checkpoint = load_checkpoint(self.checkpoint_path)
+        if checkpoint is None:
+            return Checkpoint(self.input_path, self.output_path)
+        if (checkpoint.input_path, checkpoint.output_path) != (
+                self.input_path, self.output_path):
+            raise ValueError('Контрольная точка относится к другой задаче.')
+        if checkpoint.output_position:
+            try:
+                size = os.path.getsize(self.output_path)
+            except FileNotFoundError:
+                size = 0
+            if size < checkpoint.output_position:
+                raise ValueError(
+                    f'Выход {self.output_path} короче позиции контрольной '
+                    f'точки ({size} < {checkpoint.output_position}).')
+        return checkpoint
+
+    def run(self) -> Checkpoint:
+        """Обработать вход с места последней контрольной точки."""
+        checkpoint = self.restore()
+
+        def count_error(packet: object, error: Exception) -> None:
+            checkpoint.errors += 1
+            if self.errors is not None:
+                route_error(self.errors, packet, error)
+
+        mode = 'r+b' if os.path.exists(self.output_path) else 'w+b'
+        with open(self.input_path, 'rb') as source, \
+                open(self.output_path, mode) as output:
+            source.seek(checkpoint.input_offset)
+            output.truncate(checkpoint.output_position)
+            output.seek(checkpoint.output_position)
+            while True:
+                lines = list(islice(source, self.every))
+                if not lines:
+                    break
+                packets = READERS[self.fmt](
+                    decode_lines(lines, count_error), count_error)
+                infos = []
+                for _, info in process_pairs(packets, count_error):
+                    infos.append(info)
+                    rollup = checkpoint.totals.get(info.training_type)
+                    if rollup is None:
+                        rollup = checkpoint.totals[info.training_type] = (
+                            Rollup())
+                    rollup.add(info)
+                output.write(render_messages(infos).encode('utf-8'))
+                # Output must be on disk before a checkpoint points past it.
+                output.flush()
+                os.fsync(output.fileno())
+                checkpoint.packets += len(infos)
+                checkpoint.input_offset = source.tell()
+                checkpoint.output_position = output.tell()
+                save_checkpoint(self.checkpoint_path, checkpoint)
+        return checkpoint
@@ -0,0 +1,190 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack
+from dataclasses import asdict
+from typing import BinaryIO, Iterable, Iterator, Optional, TextIO
+
+from binary import iter_packets, map_file, read_stream
+from columnar import ColumnarSink
+from compressed import EXTENSIONS as COMPRESSED
+from compressed import file_compression, read_compressed
+from homework import InfoMessage, render_messages
+from parallel import CHUNK_SIZE, process_parallel
+from stream import (PACKET_ERRORS, BoundedErrorSink, ErrorSink, Packet,
+                    process_pairs, read_packets, route_error)
+from writer import BackgroundWriter
+
+BUFFER_SIZE: int = 1 << 20  # Output buffer, bytes
+INPUT_FORMATS: tuple[str, ...] = ('jsonl', 'csv', 'binary')
+OUTPUT_FORMATS: tuple[str, ...] = ('text', 'jsonl', 'columnar')
+MODES: tuple[str, ...] = ('sequential', 'threaded', 'process')
+EXTENSIONS: dict[str, str] = {'.jsonl': 'jsonl', '.json': 'jsonl',
+                              '.csv': 'csv', '.bin': 'binary'}
+
+
+def input_format(path: str, fmt: Optional[str]) -> str:
+    """Определить формат входа по ключу или расширению файла."""
+    if fmt is not None:
+        return fmt
+    root, extension = os.path.splitext(path)
+    if extension in COMPRESSED:
+        extension = os.path.splitext(root)[1]
+    return EXTENSIONS.get(extension, 'jsonl')
+
+
+def read_inputs(stack: ExitStack, paths: list[str], fmt: Optional[str],
+                errors: BoundedErrorSink,
+                workers: Optional[int] = None) -> Iterator[Packet]:
+    """Последовательно прочитать пакеты из всех входов.
+
+    Сжатые файлы распаковываются частями в пуле из workers потоков.
+    """
+    for path in paths:
+        current = input_format(path, fmt)
+        if current == 'binary':
+            if path == '-':
+                yield from read_stream(sys.stdin.buffer)
+            else:
+                yield from iter_packets(stack.enter_context(map_file(path)))
+            continue
+        if path != '-' and file_compression(path) is not None:
+            for chunk in read_compressed(path, current, workers=workers,
+                                         errors=errors):
+                yield from chunk
+            continue
+        source = (sys.stdin if path == '-'
+                  else stack.enter_context(open(path, newline='')))
+        yield from read_packets(source, current, errors)
+
+
+def compute(packets: Iterable[Packet], args: argparse.Namespace,
+            errors: BoundedErrorSink, with_packets: bool) -> Iterator:
+    """Рассчитать пакеты в выбранном режиме исполнения."""
+    if args.mode == 'sequential':
+        pairs = process_pairs(packets, errors)
+        if with_packets:
+            return pairs
+        return (info for _, info in pairs)
+    executor_class = (ThreadPoolExecutor if args.mode == 'threaded'
+                      else ProcessPoolExecutor)
+    return process_parallel(packets, args.workers, args.chunk_size,
+                            errors=errors, executor_class=executor_class,
+                            with_packets=with_packets)
+
+
+def write_text(results: Iterable[InfoMessage], output: TextIO,
+               background: bool = False) -> None:
+    if not background:
+        render_messages(results, output)
+        return
+    with BackgroundWriter(output) as writer:
+        writer.write_all(results)
+
+
+def write_jsonl(results: Iterable[InfoMessage], output: TextIO) -> None:
+    output.writelines(json.dumps(asdict(info), ensure_ascii=False) + '\n'
+                      for info in results)
+
+
+def write_columnar(results: Iterable[tuple[Packet, InfoMessage]],
+                   output: BinaryIO,
+                   errors: Optional[ErrorSink] = None) -> int:
+    """Записать тренировки по столбцам, вернуть число записанных."""
+    written = 0
+    with ColumnarSink(output) as sink:
+        for packet, info in results:
+            try:
+                sink.add(*packet, info)
+            except PACKET_ERRORS as error:
+                route_error(errors, packet, error)
+            else:
+                written += 1
+    return written
+
+
+def open_output(stack: ExitStack, path: str, binary: bool, buffer_size: int):
+    """Открыть выход с заданным размером буфера."""
+    if path == '-':
+        sys.stdout.flush()
+        target, closefd = sys.stdout.fileno(), False
+    else:
+        target, closefd = path, True
+    return stack.enter_context(open(
+        target, 'wb' if binary else 'w', buffering=buffer_size,
+        encoding=None if binary else 'utf-8', closefd=closefd))
+
+
+def process_command(args: argparse.Namespace) -> int:
+    """Обработать входы и напечатать сводку пропускной способности."""
+    errors = BoundedErrorSink()
+    binary = args.output_format == 'columnar'
+    start = time.perf_counter()
+    count = 0
+
+    def counted(results):
+        nonlocal count
+        for result in results:
+            count += 1
+            yield result
+
+    with ExitStack() as stack:
+        packets = read_inputs(stack, args.inputs, args.format, errors,
+                              args.workers)
+        results = counted(compute(packets, args, errors, binary))
+        output = open_output(stack, args.output, binary, args.buffer_size)
+        if binary:
+            count = write_columnar(results, output, errors)
+        elif args.output_format == 'jsonl':
+            write_jsonl(results, output)
+        else:
+            write_text(results, output, args.background_writer)
+    elapsed = time.perf_counter() - start
+    print(f'Обработано: {count}, ошибок: {errors.count}, '
+          f'за {elapsed:.3f} с ({count / elapsed if elapsed else 0:,.0f} '
+          'пакетов/с)', file=sys.stderr)
+    for packet, error in errors.samples:
+        print(f'Ошибка в пакете {packet!r}: {error!r}', file=sys.stderr)
+    return 1 if errors.count and not count else 0
+
+
+def positive_int(text: str) -> int:
+    """Целое больше нуля для размеров и числа обработчиков."""
+    value = int(text)
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f'нужно число больше 0: {text}')
+    return value
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='python -m homework',
+        description='Пакетная обработка данных фитнес-трекеров.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    process = commands.add_parser('process', help='рассчитать пакеты')
+    process.add_argument('inputs', nargs='*', default=['-'],
+                         help='файлы с пакетами, "-" — стандартный ввод')
+    process.add_argument('--format', choices=INPUT_FORMATS,
+                         help='формат входа (по умолчанию по расширению)')
+    process.add_argument('-o', '--output', default='-')
+    process.add_argument('--output-format', choices=OUTPUT_FORMATS,
+                         default='text')
+    process.add_argument('--mode', choices=MODES, default='sequential')
+    process.add_argument('--workers', type=positive_int, default=None)
+    process.add_argument('--chunk-size', type=positive_int,
+                         default=CHUNK_SIZE)
+    process.add_argument('--buffer-size', type=positive_int,
+                         default=BUFFER_SIZE)
+    process.add_argument('--background-writer', action='store_true',
+                         help='писать текст в отдельном потоке')
+    process.set_defaults(handler=process_command)
+    return parser
+
+
+def run(argv: Optional[list[str]] = None) -> int:
+    """Точка входа командной строки."""
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
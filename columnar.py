@@ -0,0 +1,170 @@
+import struct
+from array import array
+from typing import BinaryIO, Iterator, Optional
+
+import numpy as np
+
+from batch import (TYPE_NUMBERS, BatchMetrics, Columns, field_names,
+                   type_numbers)
+from homework import InfoMessage
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+MAGIC: bytes = b'TRKCOL1\n'  # File header, keeps row groups 8-byte aligned
+MAGIC_FLOAT32: bytes = b'TRKCOLf\n'  # Same layout with float32 columns
+FLOAT_DTYPES: dict[bytes, np.dtype] = {MAGIC: np.dtype(np.float64),
+                                       MAGIC_FLOAT32: np.dtype(np.float32)}
+ROW_GROUP: int = 65536  # Sessions buffered before a row group is written
+GROUP_HEADER = struct.Struct('<Q')  # Rows in the following row group
+FLOAT_COLUMNS: tuple[str, ...] = (*Columns._fields, 'distance', 'speed',
+                                  'calories')
+COLUMNS: tuple[str, ...] = (*FLOAT_COLUMNS, 'type_code')  # Order on disk
+
+
+class ColumnarSink:
+    """Пакетная запись рассчитанных тренировок по столбцам."""
+
+    def __init__(self, output: BinaryIO, row_group: int = ROW_GROUP,
+                 dtype=np.float64) -> None:
+        self.output = output
+        self.row_group = row_group
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in FLOAT_DTYPES.values():
+            raise ValueError(f'Неподдерживаемый тип столбцов: {self.dtype}')
+        self.rows = 0
+        self._columns = {name: array(self.dtype.char)
+                         for name in FLOAT_COLUMNS}
+        self._columns['type_code'] = array('B')
+        self._start()
+
+    def _start(self) -> None:
+        self.output.write(MAGIC if self.dtype == np.float64
+                          else MAGIC_FLOAT32)
+
+    def _column_dtype(self, name: str) -> np.dtype:
+        return np.dtype(np.uint8) if name == 'type_code' else self.dtype
+
+    def add(self, workout_type: str, data: list, info: InfoMessage) -> None:
+        """Добавить одну тренировку: входные поля и результат расчёта."""
+        values = dict(zip(field_names(workout_type), data),
+                      distance=info.distance, speed=info.speed,
+                      calories=info.calories)
+        for name in FLOAT_COLUMNS:
+            self._columns[name].append(values.get(name, 0.0))
+        self._columns['type_code'].append(TYPE_NUMBERS[workout_type])
+        if len(self._columns['type_code']) >= self.row_group:
+            self.flush()
+
+    def add_batch(self, columns: Columns, metrics: BatchMetrics) -> None:
+        """Добавить результаты пакетного расчёта целиком."""
+        self.flush()
+        self._write_group({**columns._asdict(),
+                           'distance': metrics.distance,
+                           'speed': metrics.speed,
+                           'calories': metrics.calories,
+                           'type_code': type_numbers(metrics.type_code)})
+
+    def flush(self) -> None:
+        """Записать накопленные строки одной группой."""
+        if not len(self._columns['type_code']):
+            return
+        self._write_group({name: np.frombuffer(column, dtype=column.typecode)
+                           for name, column in self._columns.items()})
+        for column in self._columns.values():
+            del column[:]
+
+    def _write_group(self, group: dict) -> None:
+        rows = len(group['type_code'])
+        self.output.write(GROUP_HEADER.pack(rows))
+        for name in COLUMNS:
+            self.output.write(np.ascontiguousarray(
+                group[name], dtype=self._column_dtype(name)).data)
+        self.output.write(b'\0' * _padding(rows, self.dtype))
+        self.rows += rows
+
+    def close(self) -> None:
+        """Дописать остаток и сбросить буфер потока."""
+        self.flush()
+        self.output.flush()
+
+    def __enter__(self) -> 'ColumnarSink':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class ParquetSink(ColumnarSink):
+    """Та же запись по столбцам, но в Parquet через pyarrow."""
+
+    def __init__(self, path: str, row_group: int = ROW_GROUP,
+                 dtype=np.float64) -> None:
+        if pyarrow is None:
+            raise ImportError('Для записи Parquet установите pyarrow.')
+        self._writer: Optional[pyarrow.parquet.ParquetWriter] = None
+        self._path = path
+        super().__init__(None, row_group, dtype)
+
+    def _start(self) -> None:
+        pass
+
+    def _write_group(self, group: dict) -> None:
+        table = pyarrow.table({
+            name: np.asarray(group[name], dtype=self._column_dtype(name))
+            for name in COLUMNS})
+        if self._writer is None:
+            self._writer = pyarrow.parquet.ParquetWriter(self._path,
+                                                         table.schema)
+        self._writer.write_table(table)
+        self.rows += table.num_rows
+
+    def close(self) -> None:
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+
+
+def _padding(rows: int, dtype: np.dtype) -> int:
+    """Байты выравнивания группы строк до 8."""
+    return -rows * (len(FLOAT_COLUMNS) * dtype.itemsize + 1) % 8
+
+
+def float_dtype(buffer) -> np.dtype:
+    """Тип числовых столбцов файла сессий по его заголовку."""
+    dtype = FLOAT_DTYPES.get(bytes(memoryview(buffer)[:len(MAGIC)]))
+    if dtype is None:
+        raise ValueError('Неизвестный формат файла сессий.')
+    return dtype
+
+
+def read_row_groups(buffer) -> Iterator[dict[str, np.ndarray]]:
+    """Вернуть группы строк как массивы поверх буфера, без копирования."""
+    view = memoryview(buffer)
+    float_type = float_dtype(view)
+    offset = len(MAGIC)
+    while offset < len(view):
+        rows, = GROUP_HEADER.unpack_from(view, offset)
+        offset += GROUP_HEADER.size
+        group = {}
+        for name in COLUMNS:
+            dtype = np.dtype(np.uint8) if name == 'type_code' else float_type
+            group[name] = np.frombuffer(view, dtype=dtype, count=rows,
+                                        offset=offset)
+            offset += rows * dtype.itemsize
+        offset += _padding(rows, float_type)
+        yield group
+
+
+def read_columns(buffer) -> dict[str, np.ndarray]:
+    """Склеить все группы строк в один набор столбцов."""
+    groups = list(read_row_groups(buffer))
+    if not groups:
+        float_type = float_dtype(buffer)
+        return {name: np.empty(0, dtype=np.uint8 if name == 'type_code'
+                               else float_type) for name in COLUMNS}
+    return {name: np.concatenate([group[name] for group in groups])
+            for name in COLUMNS}
@@ -0,0 +1,127 @@
+import inspect
+from array import array
+from dataclasses import fields, make_dataclass
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+
+import homework
+from batch import (TYPE_CODES, TYPE_NUMBERS, BatchMetrics, Columns,
+                   compute_batch, field_names, type_class)
+
+InfoMessage = make_dataclass(
+    'InfoMessage',
+    [(field.name, field.type) for field in fields(homework.InfoMessage)],
+    namespace={'__doc__': homework.InfoMessage.__doc__,
+               '__module__': __name__,
+               'MESSAGE': homework.InfoMessage.MESSAGE,
+               'TEMPLATE': homework.InfoMessage.TEMPLATE,
+               'VALUES': homework.InfoMessage.VALUES,
+               'get_message': homework.InfoMessage.get_message},
+    slots=True,
+)
+
+
+def show_training_info(self) -> InfoMessage:
+    """Вернуть информационное сообщение о выполненной тренировке."""
+    return InfoMessage(type(self).__name__, self.duration,
+                       self.get_distance(), self.get_mean_speed(),
+                       self.get_spent_calories())
+
+
+def compute_all(self) -> homework.Metrics:
+    """Рассчитать все показатели тренировки."""
+    return homework.Metrics(self.get_distance(), self.get_mean_speed(),
+                            self.get_spent_calories())
+
+
+def _init(names: tuple[str, ...]):
+    def __init__(self, *args) -> None:
+        if len(args) != len(names):
+            raise TypeError(f'{type(self).__name__} ожидает '
+                            f'{len(names)} аргументов, получено {len(args)}')
+        for name, value in zip(names, args):
+            setattr(self, name, value)
+    return __init__
+
+
+def slotted(cls: type[homework.Training]) -> type:
+    """Построить вариант класса тренировки без __dict__ у экземпляров."""
+    namespace: dict = {}
+    for klass in reversed(cls.__mro__[:-1]):
+        namespace.update((name, value) for name, value in vars(klass).items()
+                         if not name.startswith('__'))
+    names = tuple(inspect.signature(cls).parameters)
+    namespace.update(__slots__=names, __init__=_init(names),
+                     __doc__=cls.__doc__, __module__=__name__,
+                     compute_all=compute_all,
+                     show_training_info=show_training_info)
+    return type(cls.__name__, (), namespace)
+
+
+Training = slotted(homework.Training)
+Running = slotted(homework.Running)
+SportsWalking = slotted(homework.SportsWalking)
+Swimming = slotted(homework.Swimming)
+
+CLASSES: dict[str, type] = {'SWM': Swimming,
+                            'RUN': Running,
+                            'WLK': SportsWalking}
+
+
+def read_package(workout_type: str, data: list):
+    """Прочитать данные датчиков в компактный объект тренировки."""
+    if workout_type not in CLASSES:
+        raise NotImplementedError('Получены неверные данные!')
+    return CLASSES[workout_type](*data)
+
+
+class TrainingBatch:
+    """Тренировки, хранящиеся по столбцам в плотных массивах."""
+
+    def __init__(self, packets: Iterable[tuple[str, list]] = ()) -> None:
+        self.type_code = array('b')
+        self.columns = {name: array('d') for name in Columns._fields}
+        self._metrics: Optional[BatchMetrics] = None
+        self.extend(packets)
+
+    def append(self, workout_type: str, data: list) -> None:
+        """Добавить пакет в конец набора."""
+        names = field_names(workout_type)
+        if len(data) != len(names):
+            raise TypeError(f'{workout_type} ожидает {len(names)} '
+                            f'аргументов, получено {len(data)}')
+        values = dict(zip(names, data))
+        for name, column in self.columns.items():
+            column.append(values.get(name, 0.0))
+        self.type_code.append(TYPE_NUMBERS[workout_type])
+        self._metrics = None
+
+    def extend(self, packets: Iterable[tuple[str, list]]) -> None:
+        """Добавить несколько пакетов."""
+        for workout_type, data in packets:
+            self.append(workout_type, data)
+
+    def __len__(self) -> int:
+        return len(self.type_code)
+
+    def metrics(self) -> BatchMetrics:
+        """Рассчитать показатели всех тренировок набора."""
+        if self._metrics is None:
+            self._metrics = compute_batch(
+                np.array(self.type_code, dtype=np.int8),
+                **{name: np.array(column, dtype=np.float64)
+                   for name, column in self.columns.items()})
+        return self._metrics
+
+    def __getitem__(self, index: int) -> InfoMessage:
+        metrics = self.metrics()
+        return InfoMessage(type_class(TYPE_CODES[metrics.type_code[index]])
+                           .__name__,
+                           float(metrics.duration[index]),
+                           float(metrics.distance[index]),
+                           float(metrics.speed[index]),
+                           float(metrics.calories[index]))
+
+    def __iter__(self) -> Iterator[InfoMessage]:
+        return (self[index] for index in range(len(self)))
@@ -0,0 +1,221 @@
+import bz2
+import gzip
+import io
+import lzma
+import os
+import re
+import zlib
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import (Callable, Generator, Iterable, Iterator, NamedTuple,
+                    Optional, TextIO)
+
+from binary import map_file
+from parallel import CHUNK_SIZE
+from stream import READERS, ErrorSink, Packet, decode_lines
+
+CHUNK_BYTES: int = 2**20  # Compressed bytes per decompression task
+MEMBER_BYTES: int = 4 * 2**20  # Uncompressed bytes per written member
+PENDING_PER_WORKER: int = 2  # Tasks in flight for one worker
+MAX_RATIO: int = 16  # Unpacked bytes per packed byte one task may return
+PIECE_BYTES: int = 2**20  # Output of one step when a member is streamed
+EXTENSIONS: dict[str, str] = {'.gz': 'gzip', '.bz2': 'bz2', '.xz': 'xz'}
+
+
+class Codec(NamedTuple):
+    """Формат сжатия: сигнатура начала потока и средства распаковки."""
+    signature: bytes  # Leading bytes of a file in this format
+    member: re.Pattern  # Start of every member, matches false positives too
+    decompressor: Callable
+    compress: Callable[[bytes], bytes]
+    open: Callable[..., io.IOBase]
+
+
+CODECS: dict[str, Codec] = {
+    'gzip': Codec(b'\x1f\x8b', re.compile(rb'\x1f\x8b\x08'),
+                  lambda: zlib.decompressobj(16 + zlib.MAX_WBITS),
+                  gzip.compress, gzip.open),
+    'bz2': Codec(b'BZh', re.compile(rb'BZh[1-9]1AY&SY'),
+                 bz2.BZ2Decompressor, bz2.compress, bz2.open),
+    'xz': Codec(b'\xfd7zXZ\x00', re.compile(rb'\xfd7zXZ\x00'),
+                lzma.LZMADecompressor, lzma.compress, lzma.open),
+}
+
+
+def detect_compression(head: bytes) -> Optional[str]:
+    """Определить формат сжатия по первым байтам или None."""
+    for name, codec in CODECS.items():
+        if head.startswith(codec.signature):
+            return name
+    return None
+
+
+def file_compression(path: str) -> Optional[str]:
+    """Определить формат сжатия файла по его содержимому."""
+    with open(path, 'rb') as file:
+        return detect_compression(file.read(8))
+
+
+def open_input(path: str) -> TextIO:
+    """Открыть текстовый вход, сжатый или нет, для чтения по строкам."""
+    compression = file_compression(path)
+    if compression is None:
+        return open(path, newline='', encoding='utf-8')
+    return CODECS[compression].open(path, 'rt', newline='', encoding='utf-8')
+
+
+def write_compressed(output_path: str, lines: Iterable[str],
+                     compression: str = 'gzip',
+                     member_bytes: int = MEMBER_BYTES) -> None:
+    """Сжать строки независимыми частями для параллельного чтения.
+
+    Обычные распаковщики читают такой файл как один поток.
+    """
+    compress = CODECS[compression].compress
+    with open(output_path, 'wb') as output:
+        member: list[bytes] = []
+        size = 0
+        for line in lines:
+            encoded = line.encode('utf-8')
+            member.append(encoded)
+            size += len(encoded)
+            if size >= member_bytes:
+                output.write(compress(b''.join(member)))
+                member, size = [], 0
+        if member:
+            output.write(compress(b''.join(member)))
+
+
+def decompress_range(compression: str, data: bytes,
+                     limit: int) -> tuple[bytes, bool]:
+    """Распаковать части подряд не больше чем в limit байт.
+
+    False, если диапазон оборван внутри части или распакованное
+    не уместилось в limit.
+    """
+    decompressor_class = CODECS[compression].decompressor
+    parts = []
+    size = 0
+    while data:
+        decompressor = decompressor_class()
+        part = decompressor.decompress(data, limit - size + 1)
+        size += len(part)
+        if size > limit or not decompressor.eof:
+            return b'', False
+        parts.append(part)
+        data = decompressor.unused_data
+    return b''.join(parts), True
+
+
+def stream_member(compression: str, data, start: int,
+                  piece_bytes: int = PIECE_BYTES
+                  ) -> Generator[bytes, None, int]:
+    """Распаковать одну часть с позиции start кусками до piece_bytes.
+
+    Память не зависит от размера части; возвращает смещение её конца.
+    """
+    decompressor = CODECS[compression].decompressor()
+    position = start
+    full = False  # zlib may hold output back after a full piece
+    while not decompressor.eof:
+        tail = getattr(decompressor, 'unconsumed_tail', b'')
+        if tail:
+            chunk = tail
+        elif not getattr(decompressor, 'needs_input', not full):
+            chunk = b''
+        elif position < len(data):
+            chunk = data[position:position + piece_bytes]
+            position += len(chunk)
+        else:
+            raise EOFError('Сжатый файл оборван.')
+        piece = decompressor.decompress(chunk, piece_bytes)
+        full = len(piece) == piece_bytes
+        if piece:
+            yield piece
+    return position - len(decompressor.unused_data)
+
+
+def member_ranges(data, member: re.Pattern, chunk_bytes: int,
+                  start: int = 0) -> Iterator[tuple[int, int]]:
+    """Разбить файл на диапазоны около chunk_bytes по началам частей."""
+    while start < len(data):
+        match = member.search(data, start + chunk_bytes)
+        end = len(data) if match is None else match.start()
+        yield start, end
+        start = end
+
+
+def iter_decompressed(path: str, workers: Optional[int] = None,
+                      chunk_bytes: int = CHUNK_BYTES,
+                      executor_class: type[Executor] = ThreadPoolExecutor
+                      ) -> Iterator[bytes]:
+    """Распаковать файл диапазонами в пуле и вернуть их по порядку.
+
+    Диапазон, который не распаковался целиком, — обычный файл из одной
+    части, часть больше MAX_RATIO * chunk_bytes или сигнатура части
+    внутри сжатых данных — распаковывается потоком по частям до конца
+    диапазона, после чего разбиение продолжается с конца последней части.
+    """
+    workers = workers or os.cpu_count() or 1
+    in_flight = workers * PENDING_PER_WORKER
+    with map_file(path) as data, executor_class(workers) as executor:
+        compression = detect_compression(data[:8])
+        if compression is None:
+            raise ValueError('Файл не сжат или формат не поддерживается.')
+        member = CODECS[compression].member
+        limit = chunk_bytes * MAX_RATIO
+        ranges = member_ranges(data, member, chunk_bytes)
+        pending: deque = deque()
+        while True:
+            while len(pending) < in_flight:
+                bounds = next(ranges, None)
+                if bounds is None:
+                    break
+                pending.append((*bounds, executor.submit(
+                    decompress_range, compression,
+                    data[bounds[0]:bounds[1]], limit)))
+            if not pending:
+                break
+            start, end, future = pending.popleft()
+            chunk, complete = future.result()
+            if complete:
+                yield chunk
+                continue
+            for *_, later in pending:
+                later.cancel()
+            pending.clear()
+            position = start
+            while position < end:
+                position = yield from stream_member(compression, data,
+                                                    position, PIECE_BYTES)
+            ranges = member_ranges(data, member, chunk_bytes, position)
+
+
+def read_compressed(path: str, fmt: str = 'jsonl',
+                    workers: Optional[int] = None,
+                    chunk_bytes: int = CHUNK_BYTES,
+                    errors: Optional[ErrorSink] = None,
+                    executor_class: type[Executor] = ThreadPoolExecutor,
+                    chunk_size: int = CHUNK_SIZE) -> Iterator[list[Packet]]:
+    """Прочитать сжатый файл пачками по chunk_size строк в исходном порядке.
+
+    Небольшие пачки не держат в памяти весь распакованный диапазон
+    разобранным и сразу подходят для process_parallel.
+    """
+    reader = READERS[fmt]
+    rest = b''
+    for block in iter_decompressed(path, workers, chunk_bytes,
+                                   executor_class):
+        block = rest + block
+        cut = block.rfind(b'\n') + 1
+        rest = block[cut:]
+        try:
+            lines = block[:cut].decode('utf-8').split('\n')
+        except UnicodeDecodeError:
+            lines = list(decode_lines(block[:cut].split(b'\n'), errors))
+        for start in range(0, len(lines), chunk_size):
+            packets = list(reader(lines[start:start + chunk_size], errors))
+            if packets:
+                yield packets
+    if rest:
+        yield list(reader(decode_lines([rest], errors), errors))
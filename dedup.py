@@ -0,0 +1,197 @@
+import hashlib
+import math
+import os
+import struct
+import time
+from typing import Callable, Hashable, Iterable, Iterator, Optional
+
+from stream import Packet
+
+MEMORY_BUDGET: int = 32 * 2**20  # Bytes for all generations together
+CAPACITY: int = 10_000_000  # Packets per generation at the designed rate
+WINDOW: float = 3600.0  # Seconds a packet is remembered at least
+GENERATIONS: int = 2  # Filters kept; the oldest is dropped on rotation
+
+MAGIC: bytes = b'TRKDUP1\n'  # Snapshot header, also the format version
+HEADER = struct.Struct('<QIIdd')  # Bits, hashes, generations, window, start
+GENERATION = struct.Struct('<Q')  # Packets added to a generation
+
+Event = tuple[Hashable, Hashable, Packet]  # Device id, session id, packet
+
+
+def packet_key(device_id: Hashable, session_id: Hashable,
+               workout_type: str, data) -> bytes:
+    """Ключ пакета: устройство, сессия и хеш данных; 1 и 1.0 совпадают."""
+    values = tuple(map(float, data))
+    return hashlib.blake2b(
+        repr((device_id, session_id, workout_type)).encode()
+        + struct.pack(f'<{len(values)}d', *values), digest_size=16).digest()
+
+
+class BloomFilter:
+    """Фильтр Блума на bytearray с двойным хешированием."""
+
+    def __init__(self, bits: int, hashes: int,
+                 data: Optional[bytearray] = None, count: int = 0) -> None:
+        self.bits = bits
+        self.hashes = hashes
+        self.data = bytearray((bits + 7) // 8) if data is None else data
+        self.count = count
+
+    def probes(self, key: bytes) -> list[tuple[int, int]]:
+        """Байты и маски битов ключа: h1 + i * h2 по модулю размера."""
+        first = int.from_bytes(key[:8], 'little')
+        step = int.from_bytes(key[8:16], 'little') | 1
+        bits = self.bits
+        probes = []
+        for index in range(self.hashes):
+            position = (first + index * step) % bits
+            probes.append((position >> 3, 1 << (position & 7)))
+        return probes
+
+    def has(self, probes: list[tuple[int, int]]) -> bool:
+        """Все ли биты ключа установлены."""
+        data = self.data
+        for byte, mask in probes:
+            if not data[byte] & mask:
+                return False
+        return True
+
+    def set(self, probes: list[tuple[int, int]]) -> None:
+        """Установить биты ключа."""
+        data = self.data
+        for byte, mask in probes:
+            data[byte] |= mask
+        self.count += 1
+
+    def __contains__(self, key: bytes) -> bool:
+        return self.has(self.probes(key))
+
+    def add(self, key: bytes) -> None:
+        """Добавить ключ."""
+        self.set(self.probes(key))
+
+    def false_positive_rate(self) -> float:
+        """Оценка доли ложных срабатываний при текущем заполнении."""
+        if not self.count:
+            return 0.0
+        return (1 - math.exp(-self.hashes * self.count / self.bits)
+                ) ** self.hashes
+
+
+class DuplicateFilter:
+    """Фильтр повторов с фиксированной памятью и сменой поколений.
+
+    Пакет помнится не меньше window секунд: фильтр текущего поколения
+    заменяет самый старый каждые window секунд. Ложное срабатывание
+    отбрасывает новый пакет, пропусков повторов внутри окна нет.
+    """
+
+    def __init__(self, memory: int = MEMORY_BUDGET,
+                 capacity: int = CAPACITY, window: float = WINDOW,
+                 generations: int = GENERATIONS,
+                 clock: Callable[[], float] = time.time) -> None:
+        if generations < 2:
+            raise ValueError('Нужно хотя бы два поколения.')
+        self.bits = memory * 8 // generations
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        self.window = window
+        self.clock = clock
+        self.started = clock()
+        self.duplicates = 0
+        self.generations = [BloomFilter(self.bits, self.hashes)
+                            for _ in range(generations)]
+
+    def _rotate(self) -> None:
+        elapsed = self.clock() - self.started
+        if elapsed < self.window:
+            return
+        steps = min(int(elapsed // self.window), len(self.generations))
+        for _ in range(steps):
+            self.generations.pop()
+            self.generations.insert(0, BloomFilter(self.bits, self.hashes))
+        self.started += elapsed // self.window * self.window
+
+    def seen(self, key: bytes) -> bool:
+        """Проверить ключ и запомнить его; True для повтора."""
+        self._rotate()
+        current = self.generations[0]
+        probes = current.probes(key)  # Same layout in every generation
+        if current.has(probes):
+            self.duplicates += 1
+            return True
+        current.set(probes)  # Refreshes keys found only in older generations
+        if any(generation.has(probes)
+               for generation in self.generations[1:]):
+            self.duplicates += 1
+            return True
+        return False
+
+    def check(self, device_id: Hashable, session_id: Hashable,
+              workout_type: str, data) -> bool:
+        """Проверить пакет устройства; True, если он уже приходил."""
+        return self.seen(packet_key(device_id, session_id, workout_type,
+                                    data))
+
+    def filter(self, events: Iterable[Event]) -> Iterator[Packet]:
+        """Лениво отбросить повторы из потока событий."""
+        for device_id, session_id, packet in events:
+            if not self.check(device_id, session_id, *packet):
+                yield packet
+
+    @property
+    def memory(self) -> int:
+        return sum(len(generation.data) for generation in self.generations)
+
+    def false_positive_rate(self) -> float:
+        """Оценка доли новых пакетов, принятых за повтор."""
+        passed = 1.0
+        for generation in self.generations:
+            passed *= 1 - generation.false_positive_rate()
+        return 1 - passed
+
+    def stats(self) -> dict[str, float]:
+        """Вернуть память, заполнение и оценку ложных срабатываний."""
+        return {'memory': self.memory, 'hashes': self.hashes,
+                'items': sum(generation.count
+                             for generation in self.generations),
+                'duplicates': self.duplicates,
+                'false_positive_rate': self.false_positive_rate()}
+
+    def save(self, path: str) -> None:
+        """Сохранить состояние так, чтобы файл всегда был целым."""
+        temporary = f'{path}.tmp'
+        with open(temporary, 'wb') as output:
+            output.write(MAGIC)
+            output.write(HEADER.pack(self.bits, self.hashes,
+                                     len(self.generations), self.window,
+                                     self.started))
+            for generation in self.generations:
+                output.write(GENERATION.pack(generation.count))
+                output.write(generation.data)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str,
+             clock: Callable[[], float] = time.time) -> 'DuplicateFilter':
+        """Восстановить фильтр из снимка и догнать смену поколений."""
+        with open(path, 'rb') as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError('Неизвестный формат снимка фильтра.')
+            bits, hashes, count, window, started = HEADER.unpack(
+                file.read(HEADER.size))
+            generations = []
+            for _ in range(count):
+                added, = GENERATION.unpack(file.read(GENERATION.size))
+                generations.append(BloomFilter(
+                    bits, hashes, bytearray(file.read((bits + 7) // 8)),
+                    added))
+        dedup = cls.__new__(cls)
+        dedup.bits = bits
+        dedup.hashes = hashes
+        dedup.window = window
+        dedup.clock = clock
+        dedup.started = started
+        dedup.duplicates = 0
+        dedup.generations = generations
+        return dedup
@@ -0,0 +1,109 @@
+from typing import Callable
+
+from homework import (CLASSES, InfoMessage, Running, SportsWalking, Swimming,
+                      Training)
+
+Compute = Callable[..., InfoMessage]
+
+
+def _named(compute: Compute, cls: type[Training]) -> Compute:
+    # Arity errors then read like a call of the class itself.
+    compute.__name__ = compute.__qualname__ = cls.__name__
+    return compute
+
+
+def compile_running(cls: type[Running]) -> Compute:
+    """Собрать расчёт бега с константами в локальных переменных."""
+    name = cls.__name__
+    len_step = cls.LEN_STEP
+    m_in_km = cls.M_IN_KM
+    min_in_h = cls.MIN_IN_H
+    multiplier = cls.CALORIES_MEAN_SPEED_MULTIPLIER
+    shift = cls.CALORIES_MEAN_SPEED_SHIFT
+
+    def compute(action, duration, weight):
+        distance = action * len_step / m_in_km
+        speed = distance / duration
+        return InfoMessage(name, duration, distance, speed,
+                           (multiplier * speed + shift) * weight / m_in_km
+                           * duration * min_in_h)
+    return _named(compute, cls)
+
+
+def compile_sports_walking(cls: type[SportsWalking]) -> Compute:
+    """Собрать расчёт спортивной ходьбы."""
+    name = cls.__name__
+    len_step = cls.LEN_STEP
+    m_in_km = cls.M_IN_KM
+    min_in_h = cls.MIN_IN_H
+    multiplier = cls.CALORIES_MULTIPLIER
+    shift = cls.CALORIES_SHIFT
+    kmh_in_mim = cls.KMH_IN_MIM
+    cm_in_m = cls.CM_IN_M
+
+    def compute(action, duration, weight, height):
+        distance = action * len_step / m_in_km
+        speed = distance / duration
+        return InfoMessage(name, duration, distance, speed,
+                           (multiplier * weight
+                            + (((speed * kmh_in_mim)**2)
+                               / (height / cm_in_m)) * shift
+                            * weight) * duration * min_in_h)
+    return _named(compute, cls)
+
+
+def compile_swimming(cls: type[Swimming]) -> Compute:
+    """Собрать расчёт плавания."""
+    name = cls.__name__
+    len_step = cls.LEN_STEP
+    m_in_km = cls.M_IN_KM
+    multiplier = cls.CALORIES_MULTIPLIER
+    shift = cls.CALORIES_SHIFT
+
+    def compute(action, duration, weight, length_pool, count_pool):
+        speed = length_pool * count_pool / m_in_km / duration
+        return InfoMessage(name, duration, action * len_step / m_in_km,
+                           speed, (speed + multiplier) * shift * weight
+                           * duration)
+    return _named(compute, cls)
+
+
+def compile_generic(cls: type[Training]) -> Compute:
+    """Расчёт через объект класса для типов без своего компилятора."""
+    def compute(*data):
+        return cls(*data).show_training_info()
+    return _named(compute, cls)
+
+
+COMPILERS: dict[type[Training], Callable[[type], Compute]] = {
+    Swimming: compile_swimming,
+    Running: compile_running,
+    SportsWalking: compile_sports_walking,
+}
+
+
+def compile_class(cls: type[Training]) -> Compute:
+    """Собрать расчёт для класса тренировки."""
+    return COMPILERS.get(cls, compile_generic)(cls)
+
+
+def compile_table(classes: dict[str, type[Training]] = CLASSES
+                  ) -> dict[str, Compute]:
+    """Собрать таблицу расчётов для каждого кода тренировки."""
+    return {code: compile_class(cls) for code, cls in classes.items()}
+
+
+DISPATCH: dict[str, Compute] = compile_table()
+
+
+def compute_package(workout_type: str, data) -> InfoMessage:
+    """Рассчитать сообщение по пакету без создания объекта тренировки."""
+    try:
+        compute = DISPATCH[workout_type]
+    except KeyError:
+        try:
+            cls = CLASSES[workout_type]  # May import a training plugin
+        except KeyError:
+            raise NotImplementedError('Получены неверные данные!')
+        compute = DISPATCH[workout_type] = compile_class(cls)
+    return compute(*data)
@@ -1,4 +1,27 @@
-from dataclasses import dataclass, asdict
+import re
+from dataclasses import dataclass
+from operator import attrgetter
+from string import Formatter
+from typing import Iterable, NamedTuple, Optional, TextIO
+
+from registry import Registry
+
+RENDER_CHUNK: int = 1024  # Messages joined into one write
+
+
+def compile_message(message: str) -> tuple[str, attrgetter]:
+    """Перевести шаблон str.format в шаблон % и получатель полей."""
+    parts = []
+    names = []
+    for literal, name, spec, conversion in Formatter().parse(message):
+        parts.append(literal.replace('%', '%%'))
+        if name is None:
+            continue
+        if conversion or not re.fullmatch(r'(\.\d+f)?', spec):
+            raise ValueError(f'Неподдерживаемое поле шаблона: {name}')
+        names.append(name)
+        parts.append('%' + (spec or 's'))
+    return ''.join(parts), attrgetter(*names)
 
 
 @dataclass
@@ -14,9 +37,40 @@ class InfoMessage():
                'Дистанция: {distance:.3f} км; '
                'Ср. скорость: {speed:.3f} км/ч; '
                'Потрачено ккал: {calories:.3f}.')
+    TEMPLATE, VALUES = compile_message(MESSAGE)
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        if 'MESSAGE' in vars(cls):
+            cls.TEMPLATE, cls.VALUES = compile_message(cls.MESSAGE)
 
     def get_message(self) -> str:
-        return self.MESSAGE.format(**asdict(self))
+        return self.TEMPLATE % self.VALUES(self)
+
+
+def render_messages(messages: Iterable[InfoMessage],
+                    output: Optional[TextIO] = None) -> Optional[str]:
+    """Отрисовать сообщения построчно в поток или вернуть одной строкой."""
+    # Each message class may override MESSAGE, so the template is taken
+    # from the message itself.
+    if output is None:
+        return ''.join([info.TEMPLATE % info.VALUES(info) + '\n'
+                        for info in messages])
+    chunk = []
+    for info in messages:
+        chunk.append(info.TEMPLATE % info.VALUES(info) + '\n')
+        if len(chunk) >= RENDER_CHUNK:
+            output.write(''.join(chunk))
+            chunk.clear()
+    output.write(''.join(chunk))
+    return None
+
+
+class Metrics(NamedTuple):
+    """Рассчитанные показатели тренировки."""
+    distance: float
+    speed: float
+    calories: float
 
 
 class Training:
@@ -40,17 +94,44 @@ class Training:
 
     def get_mean_speed(self) -> float:
         """Получить среднюю скорость движения."""
-        return self.get_distance() / self.duration
+        return self._mean_speed(self.get_distance())
 
     def get_spent_calories(self) -> float:
         """Получить количество затраченных калорий."""
+        return self._spent_calories(self.get_mean_speed())
+
+    def _mean_speed(self, distance: float) -> float:
+        return distance / self.duration
+
+    def _spent_calories(self, speed: float) -> float:
         pass
 
+    def _metrics(self) -> tuple[float, float, float]:
+        cls = type(self)
+        distance = self.get_distance()
+        if cls.get_mean_speed is Training.get_mean_speed:
+            speed = self._mean_speed(distance)
+        else:
+            speed = self.get_mean_speed()
+        if cls.get_spent_calories is Training.get_spent_calories:
+            calories = self._spent_calories(speed)
+        else:
+            calories = self.get_spent_calories()
+        return distance, speed, calories
+
+    def compute_all(self) -> Metrics:
+        """Рассчитать все показатели, каждый ровно один раз.
+
+        Готовые дистанция и скорость передаются в формулы скорости и
+        калорий; переопределённые get_* вызываются как есть.
+        """
+        return Metrics._make(self._metrics())
+
     def show_training_info(self) -> InfoMessage:
         """Вернуть информационное сообщение о выполненной тренировке."""
+        distance, speed, calories = self._metrics()
         return InfoMessage(self.__class__.__name__, self.duration,
-                           self.get_distance(), self.get_mean_speed(),
-                           self.get_spent_calories())
+                           distance, speed, calories)
 
 
 class Running(Training):
@@ -59,8 +140,8 @@ class Running(Training):
     CALORIES_MEAN_SPEED_MULTIPLIER: float = 18  # Const for convert calories
     CALORIES_MEAN_SPEED_SHIFT: float = 1.79  # Const for convert calories
 
-    def get_spent_calories(self):
-        return ((self.CALORIES_MEAN_SPEED_MULTIPLIER * self.get_mean_speed()
+    def _spent_calories(self, speed):
+        return ((self.CALORIES_MEAN_SPEED_MULTIPLIER * speed
                  + self.CALORIES_MEAN_SPEED_SHIFT) * self.weight / self.M_IN_KM
                 * self.duration * self.MIN_IN_H)
 
@@ -81,9 +162,9 @@ class SportsWalking(Training):
         super().__init__(action, duration, weight)
         self.height = height
 
-    def get_spent_calories(self):
+    def _spent_calories(self, speed):
         return ((self.CALORIES_MULTIPLIER * self.weight
-                 + (((self.get_mean_speed() * self.KMH_IN_MIM)**2)
+                 + (((speed * self.KMH_IN_MIM)**2)
                     / (self.height / self.CM_IN_M)) * self.CALORIES_SHIFT
                  * self.weight) * self.duration * self.MIN_IN_H)
 
@@ -105,25 +186,28 @@ class Swimming(Training):
         self.length_pool = length_pool
         self.count_pool = count_pool
 
-    def get_mean_speed(self):
+    def _mean_speed(self, distance):
+        # Swimming speed follows from the pool, not from the strokes.
         return (self.length_pool * self.count_pool / self.M_IN_KM
                 / self.duration)
 
-    def get_spent_calories(self):
-        return ((self.get_mean_speed() + self.CALORIES_MULTIPLIER)
+    def _spent_calories(self, speed):
+        return ((speed + self.CALORIES_MULTIPLIER)
                 * self.CALORIES_SHIFT * self.weight * self.duration)
 
 
-CLASSES: dict[str, type[Training]] = {'SWM': Swimming,
-                                      'RUN': Running,
-                                      'WLK': SportsWalking}
+CLASSES: Registry = Registry({'SWM': Swimming,
+                              'RUN': Running,
+                              'WLK': SportsWalking})
 
 
 def read_package(workout_type: str, data: list) -> Training:
     """Прочитать данные полученные от датчиков."""
-    if workout_type not in CLASSES:
+    try:
+        training_class = CLASSES[workout_type]
+    except KeyError:
         raise NotImplementedError('Получены неверные данные!')
-    return CLASSES[workout_type](*data)
+    return training_class(*data)
 
 
 def main(training: Training) -> None:
@@ -134,12 +218,19 @@ def main(training: Training) -> None:
 
 
 if __name__ == '__main__':
+    import sys
+
+    if len(sys.argv) > 1:
+        from cli import run
+        sys.exit(run())
+
+    from stream import process
+
+    def report_error(packet: object, error: Exception) -> None:
+        print('Ошибка, получены неверные данные!')
+
     packages = [('SWM', [720, 1, 80, 25, 40]),
                 ('RUN', [15000, 1, 75]),
                 ('WLK', [9000, 1, 75, 180])]
-    try:
-        for workout_type, data in packages:
-            training = read_package(workout_type, data)
-            main(training)
-    except (ValueError, NotImplementedError):
-        print('Ошибка, получены неверные данные!')
+    for info in process(packages, report_error):
+        print(info.get_message())
@@ -0,0 +1,175 @@
+import cProfile
+import os
+import sys
+import tracemalloc
+from bisect import bisect_left
+from collections import defaultdict
+from functools import wraps
+from time import perf_counter
+from typing import Callable, Optional
+
+import homework
+
+BUCKETS: tuple[float, ...] = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5,
+                              1e-4, 1e-3, 1e-2)  # Histogram bounds, seconds
+METHODS: tuple[str, ...] = ('__init__', 'get_distance', 'get_mean_speed',
+                            'get_spent_calories', 'show_training_info')
+TRACEMALLOC_TOP: int = 25  # Allocation sites saved by a capture window
+
+
+class StageStats:
+    """Счётчик вызовов и гистограмма длительности одной стадии."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.buckets[bisect_left(BUCKETS, seconds)] += 1
+
+
+def _class_name(workout_type: str) -> str:
+    cls = homework.CLASSES.get(workout_type)
+    return workout_type if cls is None else cls.__name__
+
+
+class Instrumentation:
+    """Замеры стадий конвейера; пока выключены, код не затронут."""
+
+    def __init__(self) -> None:
+        self.stages: defaultdict[tuple[str, str], StageStats] = (
+            defaultdict(StageStats))
+        self._restore: list[Callable[[], None]] = []
+        self._capture_left = 0
+        self._capture_path = ''
+        self._profiler: Optional[cProfile.Profile] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._restore)
+
+    def _timed(self, stage: str, func: Callable,
+               name_of: Callable) -> Callable:
+        stages = self.stages
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stages[stage, name_of(args)].add(perf_counter() - start)
+        return wrapper
+
+    def _patch(self, owner, name: str, value) -> None:
+        if name in vars(owner):
+            original = vars(owner)[name]
+            self._restore.append(lambda: setattr(owner, name, original))
+        else:
+            self._restore.append(lambda: delattr(owner, name))
+        setattr(owner, name, value)
+
+    def enable(self) -> 'Instrumentation':
+        """Обернуть стадии конвейера замерами."""
+        if self.enabled:
+            raise RuntimeError('Замеры уже включены.')
+        for cls in homework.CLASSES.values():
+            for method in METHODS:
+                self._patch(cls, method, self._timed(
+                    method, getattr(cls, method),
+                    lambda args: type(args[0]).__name__))
+        self._patch(homework.InfoMessage, 'get_message', self._timed(
+            'get_message', homework.InfoMessage.get_message,
+            lambda args: args[0].training_type))
+        original = homework.read_package
+        dispatch = self._timed('read_package', self._sampled(original),
+                               lambda args: _class_name(args[0]))
+        # Modules that did `from homework import read_package` keep their
+        # own reference, so every such binding is replaced.
+        for module in list(sys.modules.values()):
+            if getattr(module, 'read_package', None) is original:
+                self._patch(module, 'read_package', dispatch)
+        return self
+
+    def disable(self) -> None:
+        """Вернуть исходные функции и методы."""
+        self._finish_capture()
+        while self._restore:
+            self._restore.pop()()
+
+    def __enter__(self) -> 'Instrumentation':
+        return self.enable()
+
+    def __exit__(self, *args) -> None:
+        self.disable()
+
+    def capture(self, packets: int, path: str) -> None:
+        """Профилировать cProfile и tracemalloc следующие packets пакетов."""
+        self._finish_capture()
+        self._capture_left = packets
+        self._capture_path = path
+
+    def _sampled(self, read_package: Callable) -> Callable:
+        @wraps(read_package)
+        def wrapper(workout_type, data):
+            if not self._capture_left:
+                return read_package(workout_type, data)
+            if self._profiler is None:
+                tracemalloc.start()
+                self._profiler = cProfile.Profile()
+                self._profiler.enable()
+            self._capture_left -= 1
+            try:
+                return read_package(workout_type, data)
+            finally:
+                if not self._capture_left:
+                    self._finish_capture()
+        return wrapper
+
+    def _finish_capture(self) -> None:
+        self._capture_left = 0
+        if self._profiler is None:
+            return
+        self._profiler.disable()
+        self._profiler.dump_stats(self._capture_path + '.prof')
+        top = tracemalloc.take_snapshot().statistics('lineno')
+        tracemalloc.stop()
+        with open(self._capture_path + '.mem.txt', 'w') as output:
+            output.writelines(f'{line}\n' for line in top[:TRACEMALLOC_TOP])
+        self._profiler = None
+
+    def snapshot(self) -> str:
+        """Вернуть сводку по стадиям в текстовом виде."""
+        lines = [f'{"стадия":<20} {"тренировка":<14} {"вызовов":>10} '
+                 f'{"сред., мкс":>11}']
+        for (stage, name), stats in sorted(self.stages.items()):
+            mean = stats.total / stats.count * 1e6
+            lines.append(f'{stage:<20} {name:<14} {stats.count:>10} '
+                         f'{mean:>11.3f}')
+        return '\n'.join(lines) + '\n'
+
+    def prometheus(self) -> str:
+        """Вернуть замеры в текстовом формате Prometheus."""
+        lines = ['# TYPE training_stage_seconds histogram']
+        for (stage, name), stats in sorted(self.stages.items()):
+            labels = f'stage="{stage}",workout="{name}"'
+            cumulative = 0
+            for bound, count in zip((*BUCKETS, '+Inf'), stats.buckets):
+                cumulative += count
+                lines.append(f'training_stage_seconds_bucket{{{labels},'
+                             f'le="{bound}"}} {cumulative}')
+            lines.append(f'training_stage_seconds_sum{{{labels}}} '
+                         f'{stats.total!r}')
+            lines.append(f'training_stage_seconds_count{{{labels}}} '
+                         f'{stats.count}')
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str) -> None:
+        """Атомарно записать замеры для textfile-коллектора Prometheus."""
+        temporary = f'{path}.tmp'
+        with open(temporary, 'w') as output:
+            output.write(self.prometheus())
+        os.replace(temporary, path)
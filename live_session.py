@@ -0,0 +1,75 @@
+from typing import Optional
+
+from homework import InfoMessage, Swimming
+
+SNAPSHOT_THRESHOLD: float = 0.01  # Relative change that emits a snapshot
+
+
+class SwimmingSession:
+    """Идущая тренировка плавания, пересчитываемая по приращениям."""
+
+    def __init__(self, weight: float, length_pool: float,
+                 threshold: float = SNAPSHOT_THRESHOLD,
+                 training: type[Swimming] = Swimming) -> None:
+        self.weight = weight
+        self.length_pool = length_pool
+        self.threshold = threshold
+        self.training_type = training.__name__
+        self.action = 0
+        self.duration = 0.0
+        self.count_pool = 0
+        self.distance = 0.0
+        self.pool_distance = 0.0  # Km swum by pool lengths, drives speed
+        self.calories = 0.0
+        self.last: Optional[InfoMessage] = None
+        # Calories of Swimming are linear in pool distance and duration:
+        # (pool_distance / duration + k) * s * weight * duration.
+        self._km_per_step = training.LEN_STEP / training.M_IN_KM
+        self._km_per_pool = length_pool / training.M_IN_KM
+        self._calories_per_km = training.CALORIES_SHIFT * weight
+        self._calories_per_hour = (training.CALORIES_MULTIPLIER
+                                   * training.CALORIES_SHIFT * weight)
+
+    @property
+    def speed(self) -> float:
+        """Средняя скорость по бассейнам, км/ч."""
+        if not self.duration:
+            return 0.0
+        return self.pool_distance / self.duration
+
+    def update(self, action: int = 0, duration: float = 0.0,
+               count_pool: int = 0) -> Optional[InfoMessage]:
+        """Учесть приращения; вернуть снимок, если показатели сдвинулись."""
+        self.action += action
+        self.duration += duration
+        self.count_pool += count_pool
+        self.distance += action * self._km_per_step
+        pools = count_pool * self._km_per_pool
+        self.pool_distance += pools
+        self.calories += (pools * self._calories_per_km
+                          + duration * self._calories_per_hour)
+        if self.changed():
+            return self.snapshot()
+        return None
+
+    def update_totals(self, action: int, duration: float,
+                      count_pool: int) -> Optional[InfoMessage]:
+        """Учесть накопленные с начала тренировки значения трекера."""
+        return self.update(action - self.action, duration - self.duration,
+                           count_pool - self.count_pool)
+
+    def changed(self) -> bool:
+        """Сдвинулся ли хоть один показатель больше порога от снимка."""
+        if self.last is None:
+            return True
+        threshold = self.threshold
+        return any(abs(value - old) > threshold * abs(old)
+                   for value, old in ((self.distance, self.last.distance),
+                                      (self.speed, self.last.speed),
+                                      (self.calories, self.last.calories)))
+
+    def snapshot(self) -> InfoMessage:
+        """Вернуть сообщение о тренировке на текущий момент."""
+        self.last = InfoMessage(self.training_type, self.duration,
+                                self.distance, self.speed, self.calories)
+        return self.last
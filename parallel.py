@@ -0,0 +1,73 @@
+import os
+from collections import deque
+from concurrent.futures import (FIRST_COMPLETED, Executor, Future,
+                                ProcessPoolExecutor, wait)
+from itertools import islice
+from typing import Iterable, Iterator, Optional, Union
+
+from homework import InfoMessage
+from stream import ErrorSink, Packet, process, process_pairs, route_error
+
+Result = Union[InfoMessage, tuple[Packet, InfoMessage]]
+ChunkResult = tuple[list[Result], list[tuple[Packet, Exception]]]
+
+CHUNK_SIZE: int = 2000  # Packets sent to a worker in one round trip
+PENDING_PER_WORKER: int = 2  # Chunks in flight for one worker
+
+
+def chunked(packets: Iterable[Packet],
+            chunk_size: int = CHUNK_SIZE) -> Iterator[list[Packet]]:
+    """Разбить поток пакетов на списки фиксированной длины."""
+    packets = iter(packets)
+    while chunk := list(islice(packets, chunk_size)):
+        yield chunk
+
+
+def compute_chunk(packets: list[Packet],
+                  with_packets: bool = False) -> ChunkResult:
+    """Рассчитать сообщения для пачки пакетов в процессе-обработчике."""
+    failed: list[tuple[Packet, Exception]] = []
+    compute = process_pairs if with_packets else process
+    messages = list(compute(packets,
+                            lambda packet, error: failed.append(
+                                (packet, error))))
+    return messages, failed
+
+
+def _unpack(future: Future,
+            errors: Optional[ErrorSink]) -> Iterator[Result]:
+    messages, failed = future.result()
+    for packet, error in failed:
+        route_error(errors, packet, error)
+    yield from messages
+
+
+def process_parallel(packets: Iterable[Packet],
+                     workers: Optional[int] = None,
+                     chunk_size: int = CHUNK_SIZE,
+                     ordered: bool = True,
+                     errors: Optional[ErrorSink] = None,
+                     executor_class: type[Executor] = ProcessPoolExecutor,
+                     with_packets: bool = False) -> Iterator[Result]:
+    """Рассчитать сообщения пачками в пуле (по умолчанию процессов).
+
+    С with_packets=True возвращаются пары (пакет, сообщение).
+    """
+    workers = workers or os.cpu_count() or 1
+    limit = workers * PENDING_PER_WORKER
+    with executor_class(workers) as executor:
+        pending: deque = deque()
+        for chunk in chunked(packets, chunk_size):
+            pending.append(executor.submit(compute_chunk, chunk,
+                                           with_packets))
+            if len(pending) < limit:
+                continue
+            if ordered:
+                yield from _unpack(pending.popleft(), errors)
+                continue
+            done, not_done = wait(pending, return_when=FIRST_COMPLETED)
+            pending = deque(not_done)
+            for future in done:
+                yield from _unpack(future, errors)
+        while pending:
+            yield from _unpack(pending.popleft(), errors)
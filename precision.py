@@ -0,0 +1,97 @@
+import re
+from typing import NamedTuple
+
+import numpy as np
+
+from batch import TYPE_CODES, Columns, compute_batch
+
+MESSAGE_TOLERANCE: float = 1e-3  # One unit of the last printed decimal
+RELATIVE_TOLERANCE: float = 1e-6  # Several float32 roundings of a value
+METRICS: tuple[str, ...] = ('duration', 'distance', 'speed', 'calories')
+RANGES: dict[str, tuple[float, float]] = {
+    'action': (100, 60_000),
+    'duration': (0.05, 6),
+    'weight': (30, 200),
+    'height': (120, 220),
+    'length_pool': (10, 100),
+    'count_pool': (1, 200),
+}  # Realistic inputs: steps, hours, kg, cm, meters, pool lengths
+NUMBER = re.compile(r'\d+\.\d+')
+
+
+class PrecisionReport(NamedTuple):
+    """Сравнение расчёта float32 с эталоном float64."""
+    rows: int
+    max_relative_error: dict[str, float]
+    message_mismatches: int  # Messages whose text differs at all
+    message_violations: int  # Messages outside the documented tolerance
+    total_relative_error: float
+
+    @property
+    def within_tolerance(self) -> bool:
+        return (not self.message_violations
+                and self.total_relative_error <= RELATIVE_TOLERANCE)
+
+
+def realistic_columns(size: int,
+                      seed: int = 0) -> tuple[np.ndarray, Columns]:
+    """Сгенерировать коды и столбцы в реалистичных диапазонах."""
+    generator = np.random.default_rng(seed)
+    codes = generator.integers(0, len(TYPE_CODES), size)
+    columns = Columns(*(np.round(generator.uniform(low, high, size), 3)
+                        for low, high in RANGES.values()))
+    return codes, columns
+
+
+def message_within_tolerance(actual: str, expected: str) -> bool:
+    """Совпадают ли числа двух сообщений с точностью до допуска."""
+    return all(abs(float(number) - float(reference))
+               <= MESSAGE_TOLERANCE + RELATIVE_TOLERANCE * float(reference)
+               for number, reference in zip(NUMBER.findall(actual),
+                                            NUMBER.findall(expected)))
+
+
+def compare_precision(codes: np.ndarray, columns: Columns
+                      ) -> PrecisionReport:
+    """Рассчитать строки в обоих режимах и сравнить результат.
+
+    Допуск режима float32: каждое число в get_message отличается от
+    эталона float64 не больше чем на MESSAGE_TOLERANCE (единица последнего
+    печатаемого знака) плюс RELATIVE_TOLERANCE от величины, а сумма
+    калорий, накопленная во float64, — не больше чем на RELATIVE_TOLERANCE
+    от эталонной суммы.
+    """
+    reference = compute_batch(codes, *columns)
+    reduced = compute_batch(codes, *columns, dtype=np.float32)
+    max_relative_error = {}
+    for name in METRICS:
+        expected = getattr(reference, name)
+        actual = getattr(reduced, name).astype(np.float64)
+        error = np.abs(actual - expected) / np.maximum(np.abs(expected),
+                                                       np.finfo(float).tiny)
+        max_relative_error[name] = float(error.max(initial=0.0))
+    mismatches = violations = 0
+    for expected, actual in zip(reference.messages(), reduced.messages()):
+        expected_text = expected.get_message()
+        actual_text = actual.get_message()
+        if expected_text == actual_text:
+            continue
+        mismatches += 1
+        if not message_within_tolerance(actual_text, expected_text):
+            violations += 1
+    total = float(reference.calories.sum())
+    reduced_total = float(reduced.calories.sum(dtype=np.float64))
+    total_error = abs(reduced_total - total) / abs(total) if total else 0.0
+    return PrecisionReport(len(codes), max_relative_error, mismatches,
+                           violations, total_error)
+
+
+if __name__ == '__main__':
+    report = compare_precision(*realistic_columns(1_000_000))
+    print(f'Строк: {report.rows}')
+    for name, error in report.max_relative_error.items():
+        print(f'{name:<10} макс. отн. погрешность {error:.2e}')
+    print(f'Сообщений с отличиями: {report.message_mismatches}, '
+          f'вне допуска: {report.message_violations}')
+    print(f'Отн. погрешность суммы калорий: '
+          f'{report.total_relative_error:.2e}')
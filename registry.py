@@ -0,0 +1,126 @@
+import importlib.util
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+ENTRY_POINT_GROUP: str = 'homework.trainings'  # Name is the type code
+PLUGIN_PATH_ENV: str = 'TRAINING_PLUGIN_PATH'  # Plugin dirs, os.pathsep
+
+Plugin = tuple[type, Optional[Callable]]  # Scalar class and batch kernel
+
+
+def load_module_plugin(module) -> Plugin:
+    """Достать из модуля плагина класс TRAINING и ядро BATCH_KERNEL."""
+    return module.TRAINING, getattr(module, 'BATCH_KERNEL', None)
+
+
+def entry_point_loader(entry_point) -> Callable[[], Plugin]:
+    """Загрузчик плагина из точки входа пакета."""
+    def load() -> Plugin:
+        target = entry_point.load()
+        if isinstance(target, type):
+            return target, None
+        return load_module_plugin(target)
+    return load
+
+
+def file_loader(path: Path) -> Callable[[], Plugin]:
+    """Загрузчик плагина из файла каталога плагинов."""
+    def load() -> Plugin:
+        spec = importlib.util.spec_from_file_location(
+            f'training_plugins.{path.stem}', path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+        return load_module_plugin(module)
+    return load
+
+
+class Registry(dict):
+    """Классы тренировок по кодам; плагины импортируются при первом коде.
+
+    Поиск по коду, in и get находят и ещё не загруженные плагины, а
+    keys, len и перебор видят только загруженные; все сразу загружает
+    load_all.
+    """
+
+    def __init__(self, classes: dict[str, type],
+                 plugin_dirs: Optional[Iterable[str]] = None) -> None:
+        super().__init__(classes)
+        self.kernels: dict[type, Callable] = {}
+        self.sources: dict[str, Callable[[], Plugin]] = {}
+        self.plugin_dirs = plugin_dirs
+        # Reentrant: a plugin may look up other codes while it is imported.
+        self._lock = threading.RLock()
+        self._discovery = [self.discover_directories,
+                           self.discover_entry_points]
+
+    def register(self, code: str, cls: type,
+                 kernel: Optional[Callable] = None) -> None:
+        """Зарегистрировать класс тренировки и, если есть, пакетное ядро."""
+        with self._lock:
+            if kernel is not None:
+                self.kernels[cls] = kernel
+            self[code] = cls
+
+    def add_source(self, code: str, loader: Callable[[], Plugin]) -> None:
+        """Запомнить, откуда загрузить код, не импортируя плагин."""
+        self.sources.setdefault(code, loader)
+
+    def discover_directories(self) -> None:
+        """Найти плагины в каталогах, не импортируя их."""
+        plugin_dirs = self.plugin_dirs
+        if plugin_dirs is None:
+            plugin_dirs = filter(None, os.environ.get(
+                PLUGIN_PATH_ENV, '').split(os.pathsep))
+        for directory in plugin_dirs:
+            for path in sorted(Path(directory).glob('*.py')):
+                self.add_source(path.stem.upper(), file_loader(path))
+
+    def discover_entry_points(self) -> None:
+        """Найти плагины в точках входа установленных пакетов."""
+        from importlib.metadata import entry_points
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+            self.add_source(entry_point.name, entry_point_loader(entry_point))
+
+    def __missing__(self, code: str) -> type:
+        with self._lock:
+            # Another thread may have loaded the code while this one waited.
+            if super().__contains__(code):
+                return super().__getitem__(code)
+            # Scanning package metadata costs tens of milliseconds, so it
+            # runs only for codes that the plugin directories do not provide.
+            while code not in self.sources and self._discovery:
+                self._discovery.pop(0)()
+            loader = self.sources.get(code)
+            if loader is None:
+                raise KeyError(code)
+            self.register(code, *loader())
+            del self.sources[code]
+            return super().__getitem__(code)
+
+    def __contains__(self, code: object) -> bool:
+        if super().__contains__(code):
+            return True
+        try:
+            self[code]
+        except KeyError:
+            return False
+        return True
+
+    def get(self, code: str, default: Optional[type] = None
+            ) -> Optional[type]:
+        try:
+            return self[code]
+        except KeyError:
+            return default
+
+    def load_all(self) -> None:
+        """Импортировать все найденные плагины сразу."""
+        with self._lock:
+            while self._discovery:
+                self._discovery.pop(0)()
+            for code in list(self.sources):
+                self[code]
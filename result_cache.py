@@ -0,0 +1,94 @@
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+from homework import InfoMessage, read_package
+from stream import NUMERIC
+
+CACHE_SIZE: int = 65536  # Packets kept by default
+
+
+def normalize(workout_type: str, data) -> Optional[Hashable]:
+    """Привести пакет к ключу кеша: 1 и 1.0 дают один ключ.
+
+    Для данных не из int и float (строк, bool) ключа нет: такие пакеты
+    рассчитываются мимо кеша, как в read_package.
+    """
+    try:
+        values = tuple(data)
+    except TypeError:
+        return None
+    if not NUMERIC.issuperset(map(type, values)):
+        return None
+    return workout_type, tuple(map(float, values))
+
+
+class ResultCache:
+    """Потокобезопасный LRU-кеш сообщений для повторяющихся пакетов."""
+
+    def __init__(self, maxsize: int = CACHE_SIZE) -> None:
+        if maxsize <= 0:
+            raise ValueError('Размер кеша должен быть положительным.')
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, list] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _lookup(self, key: Hashable) -> Optional[list]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def _store(self, key: Hashable, entry: list) -> list:
+        with self._lock:
+            entry = self._entries.setdefault(key, entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return entry
+
+    def _entry(self, workout_type: str, data) -> list:
+        key = normalize(workout_type, data)
+        if key is None:
+            return [read_package(workout_type, data).show_training_info(),
+                    None]
+        entry = self._lookup(key)
+        if entry is None:
+            # Computed outside the lock; a concurrent miss may compute the
+            # same packet twice, and the first stored result wins.
+            info = read_package(workout_type, data).show_training_info()
+            entry = self._store(key, [info, None])
+        return entry
+
+    def info(self, workout_type: str, data) -> InfoMessage:
+        """Вернуть сообщение о тренировке, рассчитав его при промахе."""
+        return self._entry(workout_type, data)[0]
+
+    def message(self, workout_type: str, data) -> str:
+        """Вернуть готовую строку get_message для пакета."""
+        entry = self._entry(workout_type, data)
+        if entry[1] is None:
+            entry[1] = entry[0].get_message()
+        return entry[1]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Очистить кеш, сохранив счётчики."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Вернуть счётчики попаданий, промахов и вытеснений."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'evictions': self.evictions, 'size': len(self._entries)}
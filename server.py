@@ -0,0 +1,145 @@
+import argparse
+import asyncio
+from typing import Optional
+
+from homework import read_package
+from stream import parse_json_packet
+
+BATCH_SIZE: int = 512  # Packets computed in one pass of the batcher
+BATCH_DELAY: float = 0.001  # Seconds to wait for a batch to fill up
+CLIENT_PENDING: int = 1024  # Unsent results one client may accumulate
+ERROR_MESSAGE: str = 'Ошибка, получены неверные данные!'
+
+
+def compute_line(line: bytes) -> bytes:
+    """Рассчитать ответ сервера на одну строку пакета."""
+    try:
+        workout_type, data = parse_json_packet(line.decode())
+        info = read_package(workout_type, data).show_training_info()
+        return info.get_message().encode() + b'\n'
+    except Exception:
+        # One batcher serves every client, so no packet may stop it.
+        return ERROR_MESSAGE.encode() + b'\n'
+
+
+class PacketServer:
+    """Сервер, принимающий пакеты построчно от многих клиентов."""
+
+    def __init__(self,
+                 batch_size: int = BATCH_SIZE,
+                 batch_delay: float = BATCH_DELAY,
+                 client_pending: int = CLIENT_PENDING) -> None:
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.client_pending = client_pending
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._batcher: Optional[asyncio.Task] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._handlers: set[asyncio.Task] = set()
+
+    async def start(self,
+                    host: Optional[str] = None,
+                    port: Optional[int] = None,
+                    path: Optional[str] = None) -> asyncio.AbstractServer:
+        """Начать приём соединений по TCP или через Unix-сокет."""
+        self._batcher = asyncio.create_task(self._run_batcher())
+        self._batcher.add_done_callback(self._batcher_done)
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle,
+                                                           path)
+        else:
+            self._server = await asyncio.start_server(self._handle, host,
+                                                      port)
+        return self._server
+
+    async def close(self) -> None:
+        """Закрыть соединения и остановить пакетный расчёт."""
+        if self._server is not None:
+            self._server.close()
+        for handler in self._handlers:
+            handler.cancel()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        if self._batcher is not None:
+            self._batcher.cancel()
+
+    def _batcher_done(self, task: asyncio.Task) -> None:
+        """Остановить сервер, если пакетный расчёт упал."""
+        if task.cancelled() or task.exception() is None:
+            return
+        task.get_loop().call_exception_handler({
+            'message': 'Пакетный расчёт остановлен ошибкой',
+            'exception': task.exception(), 'task': task})
+        if self._server is not None:
+            self._server.close()
+        for handler in self._handlers:
+            handler.cancel()
+
+    async def _run_batcher(self) -> None:
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            if self.batch_delay and queue.qsize() < self.batch_size:
+                await asyncio.sleep(self.batch_delay)
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            for line, future in batch:
+                if not future.done():
+                    future.set_result(compute_line(line))
+
+    async def _handle(self, reader: asyncio.StreamReader,
+                      writer: asyncio.StreamWriter) -> None:
+        loop = asyncio.get_running_loop()
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        results: asyncio.Queue = asyncio.Queue(self.client_pending)
+        sender = asyncio.create_task(self._send(results, writer))
+        sender.add_done_callback(
+            lambda task: task.cancelled() or task.exception() is None
+            or handler.cancel())
+        try:
+            async for line in reader:
+                if not line.strip():
+                    continue
+                future = loop.create_future()
+                await self._queue.put((line, future))
+                await results.put(future)
+            await results.put(None)
+            await sender
+        except (ConnectionError, asyncio.CancelledError):
+            # A cancelled connection callback is reported as an unhandled
+            # error by asyncio, so the handler finishes quietly instead.
+            pass
+        finally:
+            sender.cancel()
+            writer.close()
+            self._handlers.discard(handler)
+
+    @staticmethod
+    async def _send(results: asyncio.Queue,
+                    writer: asyncio.StreamWriter) -> None:
+        while (future := await results.get()) is not None:
+            writer.write(await future)
+            if results.empty():
+                await writer.drain()
+        await writer.drain()
+
+
+async def serve(host: Optional[str], port: Optional[int],
+                path: Optional[str]) -> None:
+    """Запустить сервер до прерывания."""
+    server = PacketServer()
+    listener = await server.start(host, port, path)
+    try:
+        await listener.serve_forever()
+    finally:
+        await server.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Сервер приёма пакетов фитнес-трекеров.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', dest='path', help='путь к Unix-сокету')
+    args = parser.parse_args()
+    asyncio.run(serve(args.host, args.port, args.path))
@@ -0,0 +1,209 @@
+import heapq
+import mmap
+import os
+import struct
+from datetime import datetime
+from typing import Iterable, NamedTuple, Optional, Union
+
+import numpy as np
+
+from homework import InfoMessage
+
+MAGIC: bytes = b'TRKIDX1\n'  # File header, keeps columns 8-byte aligned
+COUNT = struct.Struct('<Q')  # Number of series in the file
+SERIES_HEADER = struct.Struct('<16s32sQ')  # Code, training type, rows
+FIELDS: tuple[str, ...] = ('timestamp', 'duration', 'distance', 'speed',
+                           'calories')
+MIN_CAPACITY: int = 16  # Rows allocated for a new series
+
+Moment = Union[datetime, float]
+
+
+class Session(NamedTuple):
+    """Тренировка в индексе: время начала и рассчитанное сообщение."""
+    timestamp: float
+    info: InfoMessage
+
+
+def to_timestamp(moment: Optional[Moment]) -> Optional[float]:
+    """Привести момент времени к секундам POSIX."""
+    if isinstance(moment, datetime):
+        return moment.timestamp()
+    return moment
+
+
+class _Series:
+    """Тренировки одного вида, отсортированные по времени, по столбцам."""
+
+    def __init__(self, training_type: str,
+                 columns: Optional[dict[str, np.ndarray]] = None) -> None:
+        self.training_type = training_type
+        if columns is None:
+            columns = {name: np.empty(MIN_CAPACITY) for name in FIELDS}
+            self.size = 0
+        else:
+            self.size = len(columns['timestamp'])
+        self.columns = columns
+
+    def _reserve(self) -> None:
+        # Columns mapped from a file are read-only: the first insert copies
+        # them into memory, later ones reuse the spare capacity.
+        timestamps = self.columns['timestamp']
+        if self.size < len(timestamps) and timestamps.flags.writeable:
+            return
+        capacity = max(MIN_CAPACITY, 2 * self.size)
+        for name, column in self.columns.items():
+            grown = np.empty(capacity)
+            grown[:self.size] = column[:self.size]
+            self.columns[name] = grown
+
+    def insert(self, timestamp: float, info: InfoMessage) -> None:
+        """Вставить тренировку, сохранив порядок по времени."""
+        self._reserve()
+        size = self.size
+        timestamps = self.columns['timestamp']
+        if not size or timestamps[size - 1] <= timestamp:
+            position = size  # Usual case: sessions arrive in time order
+        else:
+            position = int(np.searchsorted(timestamps[:size], timestamp,
+                                           side='right'))
+        values = (timestamp, info.duration, info.distance, info.speed,
+                  info.calories)
+        for name, value in zip(FIELDS, values):
+            column = self.columns[name]
+            column[position + 1:size + 1] = column[position:size]
+            column[position] = value
+        self.size += 1
+
+    def bounds(self, start: Optional[float],
+               end: Optional[float]) -> tuple[int, int]:
+        """Найти бинарным поиском строки с start <= время < end."""
+        timestamps = self.columns['timestamp'][:self.size]
+        low = 0 if start is None else int(np.searchsorted(timestamps, start))
+        high = (self.size if end is None
+                else int(np.searchsorted(timestamps, end)))
+        return low, max(low, high)
+
+    def session(self, row: int) -> Session:
+        """Собрать сообщение о тренировке по номеру строки."""
+        timestamp, duration, distance, speed, calories = (
+            self.columns[name][row].item() for name in FIELDS)
+        return Session(timestamp, InfoMessage(self.training_type, duration,
+                                              distance, speed, calories))
+
+
+class SessionIndex:
+    """Индекс рассчитанных тренировок по виду и времени."""
+
+    def __init__(self) -> None:
+        self._series: dict[str, _Series] = {}
+        self._mmap: Optional[mmap.mmap] = None
+
+    def add(self, workout_type: str, moment: Moment,
+            info: InfoMessage) -> None:
+        """Добавить тренировку; в порядке времени вставка за O(1)."""
+        series = self._series.get(workout_type)
+        if series is None:
+            series = self._series[workout_type] = _Series(info.training_type)
+        series.insert(to_timestamp(moment), info)
+
+    def extend(self, events: Iterable[tuple[str, Moment, InfoMessage]]
+               ) -> None:
+        """Добавить поток событий (код тренировки, время, сообщение)."""
+        for workout_type, moment, info in events:
+            self.add(workout_type, moment, info)
+
+    def range(self, workout_type: str, start: Optional[Moment] = None,
+              end: Optional[Moment] = None) -> list[Session]:
+        """Вернуть тренировки вида за полуинтервал [start, end)."""
+        series = self._series.get(workout_type)
+        if series is None:
+            return []
+        low, high = series.bounds(to_timestamp(start), to_timestamp(end))
+        return [series.session(row) for row in range(low, high)]
+
+    def above(self, workout_type: str, field: str, threshold: float,
+              start: Optional[Moment] = None,
+              end: Optional[Moment] = None) -> list[Session]:
+        """Вернуть тренировки за период, где показатель больше порога."""
+        series = self._series.get(workout_type)
+        if series is None:
+            return []
+        low, high = series.bounds(to_timestamp(start), to_timestamp(end))
+        rows = np.flatnonzero(series.columns[field][low:high] > threshold)
+        return [series.session(low + row) for row in rows.tolist()]
+
+    def top_k(self, workout_type: str, k: int, field: str = 'calories',
+              start: Optional[Moment] = None,
+              end: Optional[Moment] = None) -> list[Session]:
+        """Вернуть k тренировок с наибольшим показателем за период."""
+        series = self._series.get(workout_type)
+        if series is None:
+            return []
+        low, high = series.bounds(to_timestamp(start), to_timestamp(end))
+        values = series.columns[field][low:high].tolist()
+        rows = heapq.nlargest(k, range(len(values)), key=values.__getitem__)
+        return [series.session(low + row) for row in rows]
+
+    @property
+    def workout_types(self) -> list[str]:
+        return list(self._series)
+
+    def __len__(self) -> int:
+        return sum(series.size for series in self._series.values())
+
+    def save(self, path: str) -> None:
+        """Записать индекс в файл целиком и подменить старый файл."""
+        # The old file may be mapped by this very index, so it is replaced
+        # by rename instead of being overwritten in place.
+        temporary = f'{path}.tmp'
+        with open(temporary, 'wb') as output:
+            output.write(MAGIC)
+            output.write(COUNT.pack(len(self._series)))
+            for workout_type, series in self._series.items():
+                output.write(SERIES_HEADER.pack(
+                    workout_type.encode(), series.training_type.encode(),
+                    series.size))
+                for name in FIELDS:
+                    output.write(np.ascontiguousarray(
+                        series.columns[name][:series.size]).data)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'SessionIndex':
+        """Отобразить файл индекса в память без чтения столбцов."""
+        index = cls()
+        with open(path, 'rb') as file:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if data[:len(MAGIC)] != MAGIC:
+            data.close()
+            raise ValueError('Неизвестный формат файла индекса.')
+        count, = COUNT.unpack_from(data, len(MAGIC))
+        offset = len(MAGIC) + COUNT.size
+        for _ in range(count):
+            code, training_type, rows = SERIES_HEADER.unpack_from(data,
+                                                                  offset)
+            offset += SERIES_HEADER.size
+            columns = {}
+            for name in FIELDS:
+                columns[name] = np.frombuffer(data, dtype=np.float64,
+                                              count=rows, offset=offset)
+                offset += rows * 8
+            index._series[code.rstrip(b'\0').decode()] = _Series(
+                training_type.rstrip(b'\0').decode(), columns)
+        index._mmap = data
+        return index
+
+    def close(self) -> None:
+        """Освободить отображённый в память файл."""
+        if self._mmap is None:
+            return
+        self._series.clear()
+        self._mmap.close()
+        self._mmap = None
+
+    def __enter__(self) -> 'SessionIndex':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -0,0 +1,114 @@
+import csv
+import json
+from collections import deque
+from typing import Callable, Iterable, Iterator, Optional, TextIO
+
+from homework import InfoMessage, read_package
+
+Packet = tuple[str, list]
+ErrorSink = Callable[[object, Exception], None]
+
+PACKET_ERRORS = (TypeError, ValueError, NotImplementedError,
+                 ZeroDivisionError,
+                 OverflowError)  # Errors of a single broken packet
+NUMERIC: frozenset[type] = frozenset({int, float})  # Packet field types
+
+
+class BoundedErrorSink:
+    """Приёмник ошибок, хранящий только последние примеры."""
+
+    def __init__(self, limit: int = 100) -> None:
+        self.count = 0
+        self.samples: deque = deque(maxlen=limit)
+
+    def __call__(self, packet: object, error: Exception) -> None:
+        self.count += 1
+        self.samples.append((packet, error))
+
+
+def route_error(errors: Optional[ErrorSink], packet: object,
+                error: Exception) -> None:
+    """Передать ошибку в приёмник или выбросить её, если его нет."""
+    if errors is None:
+        raise error
+    errors(packet, error)
+
+
+def decode_lines(lines: Iterable[bytes],
+                 errors: Optional[ErrorSink] = None) -> Iterator[str]:
+    """Декодировать строки UTF-8, передавая испорченные в приёмник."""
+    for line in lines:
+        try:
+            yield line.decode('utf-8')
+        except UnicodeDecodeError as error:
+            route_error(errors, line, error)
+
+
+def _packet(workout_type: object, data: object) -> Packet:
+    if not isinstance(workout_type, str) or not isinstance(data, list):
+        raise ValueError('Получены неверные данные!')
+    return workout_type, data
+
+
+def parse_json_packet(line: str) -> Packet:
+    """Разобрать пакет JSON: ["RUN", [...]] или объект."""
+    record = json.loads(line)
+    if isinstance(record, dict):
+        return _packet(record.get('workout_type'), record.get('data'))
+    return _packet(*record)
+
+
+def read_jsonl(source: TextIO,
+               errors: Optional[ErrorSink] = None) -> Iterator[Packet]:
+    """Прочитать пакеты из JSON Lines."""
+    for line in source:
+        if not line.strip():
+            continue
+        try:
+            yield parse_json_packet(line)
+        except PACKET_ERRORS as error:
+            route_error(errors, line, error)
+
+
+def read_csv(source: TextIO,
+             errors: Optional[ErrorSink] = None) -> Iterator[Packet]:
+    """Прочитать пакеты из CSV: код тренировки и числовые поля."""
+    for row in csv.reader(source):
+        if not row:
+            continue
+        try:
+            yield row[0].strip(), [float(value) for value in row[1:]]
+        except PACKET_ERRORS as error:
+            route_error(errors, row, error)
+
+
+READERS: dict[str, Callable[..., Iterator[Packet]]] = {'jsonl': read_jsonl,
+                                                       'csv': read_csv}
+
+
+def read_packets(source: TextIO, fmt: str,
+                 errors: Optional[ErrorSink] = None) -> Iterator[Packet]:
+    """Прочитать пакеты в указанном формате."""
+    if fmt not in READERS:
+        raise NotImplementedError(f'Неизвестный формат: {fmt}')
+    return READERS[fmt](source, errors)
+
+
+def process_pairs(packets: Iterable[Packet],
+                  errors: Optional[ErrorSink] = None
+                  ) -> Iterator[tuple[Packet, InfoMessage]]:
+    """Лениво рассчитать пакеты, возвращая пары (пакет, сообщение)."""
+    for packet in packets:
+        try:
+            workout_type, data = packet
+            yield packet, read_package(workout_type,
+                                       data).show_training_info()
+        except PACKET_ERRORS as error:
+            route_error(errors, packet, error)
+
+
+def process(packets: Iterable[Packet],
+            errors: Optional[ErrorSink] = None) -> Iterator[InfoMessage]:
+    """Лениво превратить пакеты в информационные сообщения."""
+    for _, info in process_pairs(packets, errors):
+        yield info
@@ -0,0 +1,267 @@
+import math
+from typing import NamedTuple, Optional
+
+from homework import InfoMessage
+from session_index import Moment, to_timestamp
+
+WINDOW: float = 600.0  # Seconds of history kept, 10 minutes
+BUCKETS: int = 10  # Window slices; old data expires one slice at a time
+RELATIVE_ACCURACY: float = 0.01  # Quantile error relative to the value
+Z_THRESHOLD: float = 4.0  # Standard deviations from the window mean
+MIN_COUNT: int = 30  # Sessions in the window before z-scores are trusted
+METRICS: tuple[str, ...] = ('speed', 'calories')
+LIMITS: dict[str, dict[str, float]] = {
+    'Running': {'speed': 45.0},
+    'SportsWalking': {'speed': 20.0},
+    'Swimming': {'speed': 10.0},
+}  # Physically impossible values, km/h
+
+
+class Moments:
+    """Количество, среднее и сумма квадратов отклонений по Уэлфорду."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value: float) -> None:
+        """Учесть значение за O(1)."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def merge(self, other: 'Moments') -> None:
+        """Объединить с моментами, посчитанными отдельно (формула Чана)."""
+        if not other.count:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+
+    @property
+    def variance(self) -> float:
+        """Дисперсия выборки."""
+        if self.count < 2:
+            return 0.0
+        return self.m2 / (self.count - 1)
+
+
+class QuantileSketch:
+    """Эскиз квантилей на логарифмических корзинах.
+
+    Квантиль неотрицательной величины возвращается с относительной
+    погрешностью не больше relative_accuracy; эскизы с одинаковой
+    точностью складываются без потерь. Бесконечности и NaN в квантили
+    не входят и считаются отдельно в nonfinite.
+    """
+
+    def __init__(self, relative_accuracy: float = RELATIVE_ACCURACY) -> None:
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins: dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+        self.nonfinite = 0
+
+    def add(self, value: float) -> None:
+        """Учесть неотрицательное значение за O(1)."""
+        if not math.isfinite(value):
+            self.nonfinite += 1
+            return
+        self.count += 1
+        if value <= 0:
+            self.zeros += 1
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self.bins[key] = self.bins.get(key, 0) + 1
+
+    def merge(self, other: 'QuantileSketch') -> None:
+        """Прибавить эскиз другого окна или обработчика."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError('Эскизы с разной точностью не складываются.')
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.zeros += other.zeros
+        self.count += other.count
+        self.nonfinite += other.nonfinite
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Вернуть квантиль уровня q или None для пустого эскиза."""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if rank < seen:
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.bins) / (self.gamma + 1)
+
+
+class Bucket:
+    """Статистика показателей за один отрезок окна."""
+
+    def __init__(self, relative_accuracy: float = RELATIVE_ACCURACY) -> None:
+        self.moments = {metric: Moments() for metric in METRICS}
+        self.sketches = {metric: QuantileSketch(relative_accuracy)
+                         for metric in METRICS}
+
+    def add(self, info: InfoMessage) -> None:
+        for metric in METRICS:
+            value = getattr(info, metric)
+            self.sketches[metric].add(value)
+            if math.isfinite(value):
+                self.moments[metric].add(value)
+
+    def merge(self, other: 'Bucket') -> None:
+        for metric in METRICS:
+            self.moments[metric].merge(other.moments[metric])
+            self.sketches[metric].merge(other.sketches[metric])
+
+
+class Anomaly(NamedTuple):
+    """Подозрительное значение показателя тренировки."""
+    training_type: str
+    metric: str
+    value: float
+    reason: str
+
+
+class StreamingStats:
+    """Скользящая статистика и флаги выбросов по видам тренировок.
+
+    Окно хранит не сами тренировки, а buckets отрезков с моментами и
+    эскизами квантилей; отрезки выровнены по времени, поэтому статистику
+    разных обработчиков можно сложить через merge.
+    """
+
+    def __init__(self, window: float = WINDOW, buckets: int = BUCKETS,
+                 relative_accuracy: float = RELATIVE_ACCURACY,
+                 z_threshold: float = Z_THRESHOLD,
+                 min_count: int = MIN_COUNT,
+                 limits: dict[str, dict[str, float]] = LIMITS) -> None:
+        self.width = window / buckets
+        self.buckets = buckets
+        self.relative_accuracy = relative_accuracy
+        self.z_threshold = z_threshold
+        self.min_count = min_count
+        self.limits = limits
+        self.latest: Optional[int] = None  # Newest bucket number seen
+        self._windows: dict[str, dict[int, Bucket]] = {}
+        # Moments of every bucket but the newest, per type; they change
+        # only when the window slides or an old bucket gets late data.
+        self._closed: dict[str, dict[str, Moments]] = {}
+
+    def _advance(self, latest: int) -> None:
+        if self.latest is None or latest > self.latest:
+            self.latest = latest
+            self._prune()
+
+    def _prune(self) -> None:
+        self._closed.clear()
+        for window in self._windows.values():
+            for number in [number for number in window
+                           if not self._live(number)]:
+                del window[number]
+
+    def _live(self, number: int) -> bool:
+        return number > self.latest - self.buckets
+
+    def _closed_moments(self, training_type: str) -> dict[str, Moments]:
+        closed = self._closed.get(training_type)
+        if closed is None:
+            closed = self._closed[training_type] = {
+                metric: Moments() for metric in METRICS}
+            for number, bucket in self._windows.get(training_type,
+                                                    {}).items():
+                if number != self.latest:
+                    for metric in METRICS:
+                        closed[metric].merge(bucket.moments[metric])
+        return closed
+
+    def check(self, info: InfoMessage) -> list[Anomaly]:
+        """Сравнить тренировку с пределами и текущим окном её вида."""
+        anomalies = []
+        limits = self.limits.get(info.training_type, {})
+        window = self._windows.get(info.training_type, {})
+        closed = self._closed_moments(info.training_type)
+        for metric in METRICS:
+            value = getattr(info, metric)
+            if not math.isfinite(value):
+                # A zero duration gives an infinite speed; such a value
+                # is flagged but kept out of the window statistics.
+                anomalies.append(Anomaly(info.training_type, metric, value,
+                                         'не конечное число'))
+                continue
+            limit = limits.get(metric)
+            if limit is not None and value > limit:
+                anomalies.append(Anomaly(info.training_type, metric, value,
+                                         f'больше предела {limit:g}'))
+                continue
+            moments = Moments()
+            moments.merge(closed[metric])
+            newest = window.get(self.latest)
+            if newest is not None:
+                moments.merge(newest.moments[metric])
+            if moments.count < self.min_count or not moments.variance:
+                continue
+            score = (value - moments.mean) / math.sqrt(moments.variance)
+            if abs(score) > self.z_threshold:
+                anomalies.append(Anomaly(info.training_type, metric, value,
+                                         f'отклонение {score:+.1f} сигм'))
+        return anomalies
+
+    def add(self, moment: Moment, info: InfoMessage) -> list[Anomaly]:
+        """Проверить тренировку на выбросы и учесть её в окне."""
+        number = int(to_timestamp(moment) // self.width)
+        self._advance(number)
+        if not self._live(number):
+            return []  # Older than the window
+        anomalies = self.check(info)
+        window = self._windows.setdefault(info.training_type, {})
+        if number != self.latest:
+            self._closed.pop(info.training_type, None)
+        bucket = window.get(number)
+        if bucket is None:
+            bucket = window[number] = Bucket(self.relative_accuracy)
+        bucket.add(info)
+        return anomalies
+
+    def merge(self, other: 'StreamingStats') -> None:
+        """Прибавить окна, собранные другим обработчиком."""
+        if other.width != self.width:
+            raise ValueError('Окна с разными отрезками не складываются.')
+        for training_type, buckets in other._windows.items():
+            window = self._windows.setdefault(training_type, {})
+            for number, bucket in buckets.items():
+                if number not in window:
+                    window[number] = Bucket(self.relative_accuracy)
+                window[number].merge(bucket)
+        if other.latest is not None:
+            self._advance(other.latest)
+        if self.latest is not None:
+            self._prune()
+
+    def summary(self, training_type: str) -> Bucket:
+        """Свести отрезки окна вида тренировки в одну статистику."""
+        total = Bucket(self.relative_accuracy)
+        for bucket in self._windows.get(training_type, {}).values():
+            total.merge(bucket)
+        return total
+
+    def mean(self, training_type: str, metric: str) -> float:
+        return self.summary(training_type).moments[metric].mean
+
+    def variance(self, training_type: str, metric: str) -> float:
+        return self.summary(training_type).moments[metric].variance
+
+    def quantile(self, training_type: str, metric: str,
+                 q: float) -> Optional[float]:
+        return self.summary(training_type).sketches[metric].quantile(q)
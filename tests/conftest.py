@@ -27,5 +27,30 @@ class Capturing(list):
         sys.stdout = self._stdout
 
 
+SAMPLE_PACKETS = [('SWM', [720, 1, 80, 25, 40]),
+                  ('RUN', [15000, 1, 75]),
+                  ('WLK', [9000, 1.5, 75, 180])]
+
+
+def make_packets(size, seed=0):
+    from benchmarks.packets import make_packets
+
+    return make_packets(size, seed)
+
+
+def expected_messages(packets):
+    """Сообщения read_package для пакетов, неверные пропускаются."""
+    import homework
+
+    messages = []
+    for packet in packets:
+        try:
+            training = homework.read_package(*packet)
+        except (TypeError, NotImplementedError):
+            continue
+        messages.append(training.show_training_info())
+    return messages
+
+
 def pytest_make_parametrize_id(config, val):
     return repr(val)
@@ -0,0 +1,59 @@
+from datetime import date, datetime
+
+import pytest
+
+import homework
+from aggregation import DAY, WEEK, Aggregator, Rollup, period_start
+
+
+def info(packet):
+    return homework.read_package(*packet).show_training_info()
+
+
+RUN = info(('RUN', [15000, 1, 75]))
+WLK = info(('WLK', [9000, 2, 75, 180]))
+SWM = info(('SWM', [720, 1, 80, 25, 40]))
+
+EVENTS = [('ann', datetime(2024, 5, 6, 8), RUN),
+          ('ann', datetime(2024, 5, 6, 19), WLK),
+          ('ann', datetime(2024, 5, 8, 7), RUN),
+          ('bob', datetime(2024, 5, 6, 9), SWM),
+          ('ann', datetime(2024, 5, 13, 7), SWM)]
+
+
+def test_period_start():
+    assert period_start(DAY, datetime(2024, 5, 8, 7)) == date(2024, 5, 8)
+    assert period_start(WEEK, date(2024, 5, 12)) == date(2024, 5, 6)
+    with pytest.raises(ValueError):
+        period_start('month', date(2024, 5, 12))
+
+
+def test_daily_and_weekly_rollups():
+    aggregator = Aggregator()
+    aggregator.extend(EVENTS)
+    day = aggregator.get(DAY, date(2024, 5, 6), 'ann')
+    assert day.sessions == 2
+    assert day.distance == RUN.distance + WLK.distance
+    assert day.mean_speed == pytest.approx(
+        (RUN.speed * RUN.duration + WLK.speed * WLK.duration)
+        / (RUN.duration + WLK.duration))
+    week = aggregator.get(WEEK, date(2024, 5, 9), 'ann', 'Running')
+    assert week.sessions == 2
+    assert week.calories == RUN.calories * 2
+    assert aggregator.get(WEEK, date(2024, 5, 6), 'bob').sessions == 1
+    assert aggregator.get(DAY, date(2024, 5, 7), 'ann') == Rollup()
+
+
+def test_merge_matches_single_aggregator():
+    whole = Aggregator()
+    whole.extend(EVENTS)
+    left, right = Aggregator(), Aggregator()
+    left.extend(EVENTS[::2])
+    right.extend(EVENTS[1::2])
+    left.merge(right)
+    for period, moment, user in [(DAY, date(2024, 5, 6), 'ann'),
+                                 (WEEK, date(2024, 5, 6), 'ann'),
+                                 (WEEK, date(2024, 5, 13), 'ann'),
+                                 (WEEK, date(2024, 5, 6), 'bob')]:
+        assert (left.get(period, moment, user)
+                == whole.get(period, moment, user))
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+import homework
+from batch import compute_batch, encode_types
+from conftest import make_packets
+
+
+def to_columns(packets):
+    height, length_pool, count_pool = [], [], []
+    for workout_type, data in packets:
+        height.append(data[3] if workout_type == 'WLK' else 0)
+        length_pool.append(data[3] if workout_type == 'SWM' else 0)
+        count_pool.append(data[4] if workout_type == 'SWM' else 0)
+    return dict(
+        type_code=encode_types(code for code, _ in packets),
+        action=[data[0] for _, data in packets],
+        duration=[data[1] for _, data in packets],
+        weight=[data[2] for _, data in packets],
+        height=height,
+        length_pool=length_pool,
+        count_pool=count_pool,
+    )
+
+
+def test_compute_batch_matches_scalar_classes():
+    packets = make_packets(2000)
+    metrics = compute_batch(**to_columns(packets))
+    for (workout_type, data), message in zip(packets, metrics.messages()):
+        expected = homework.read_package(workout_type, data)
+        assert message == expected.show_training_info()
+
+
+def test_compute_batch_accepts_string_codes():
+    metrics = compute_batch(['RUN', 'SWM'], [15000, 720], [1, 1], [75, 80],
+                            length_pool=[0, 25], count_pool=[0, 40])
+    assert metrics.calories.tolist() == [
+        homework.Running(15000, 1, 75).get_spent_calories(),
+        homework.Swimming(720, 1, 80, 25, 40).get_spent_calories(),
+    ]
+    assert isinstance(metrics.distance, np.ndarray)
+
+
+def test_compute_batch_unknown_type():
+    with pytest.raises(NotImplementedError):
+        compute_batch(['BOX'], [1], [1], [1])
+    with pytest.raises(NotImplementedError):
+        compute_batch([7], [1], [1], [1])
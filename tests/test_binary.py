@@ -0,0 +1,64 @@
+import io
+
+import pytest
+
+import homework
+from binary import (RECORD, compute_records, iter_packets, map_file,
+                    read_records, read_stream, write_packets)
+from conftest import SAMPLE_PACKETS, expected_messages
+
+PACKETS = SAMPLE_PACKETS + [('WLK', [3000.33, 2.512, 75.8, 180.1])]
+
+
+def test_round_trip_through_scalar_classes(tmp_path):
+    path = tmp_path / 'packets.bin'
+    with open(path, 'wb') as output:
+        assert write_packets(output, PACKETS) == len(PACKETS)
+    with map_file(path) as data:
+        packets = list(iter_packets(data))
+    assert packets == [(code, tuple(data)) for code, data in PACKETS]
+    assert [homework.read_package(*packet).show_training_info()
+            for packet in packets] == expected_messages(PACKETS)
+
+
+def test_round_trip_through_batch(tmp_path):
+    path = tmp_path / 'packets.bin'
+    with open(path, 'wb') as output:
+        write_packets(output, PACKETS)
+    with map_file(path) as data:
+        metrics = compute_records(read_records(data))
+    # The metrics outlive the mapping they were computed from.
+    assert list(metrics.messages()) == expected_messages(PACKETS)
+
+
+class ShortReads(io.BytesIO):
+    """Поток, как канал, отдающий не больше 7 байт за чтение."""
+
+    def read(self, size=-1):
+        return super().read(min(size, 7) if size > 0 else 7)
+
+
+def test_read_stream_in_small_reads():
+    output = io.BytesIO()
+    write_packets(output, PACKETS)
+    packets = list(read_stream(ShortReads(output.getvalue()), records=3))
+    assert packets == [(code, tuple(map(float, data)))
+                       for code, data in PACKETS]
+    with pytest.raises(ValueError):
+        list(read_stream(io.BytesIO(output.getvalue()[:-1])))
+
+
+def test_write_rejects_bad_packets():
+    with pytest.raises(TypeError):
+        write_packets(io.BytesIO(), [('RUN', [15000, 1])])
+    with pytest.raises(NotImplementedError):
+        write_packets(io.BytesIO(), [('BOX', [1, 1, 1])])
+
+
+def test_read_rejects_bad_files():
+    with pytest.raises(ValueError):
+        list(iter_packets(b'XXXX'))
+    with pytest.raises(ValueError):
+        read_records(b'TRK1' + b'\0' * (RECORD.size - 1))
+    with pytest.raises(NotImplementedError):
+        list(iter_packets(b'TRK1' + RECORD.pack(9, 1, 1, 1, 0, 0)))
@@ -0,0 +1,103 @@
+import json
+import os
+
+import pytest
+
+import checkpoint
+import homework
+from checkpoint import Checkpoint, CheckpointedJob, load_checkpoint
+from conftest import SAMPLE_PACKETS, expected_messages
+
+PACKETS = SAMPLE_PACKETS * 31 + [('BOX', [1, 1])]
+
+
+@pytest.fixture
+def paths(tmp_path):
+    source = tmp_path / 'packets.jsonl'
+    source.write_text(''.join(json.dumps(packet) + '\n'
+                              for packet in PACKETS))
+    return (str(source), str(tmp_path / 'out.txt'),
+            str(tmp_path / 'job.checkpoint'))
+
+
+def expected_output():
+    return homework.render_messages(expected_messages(PACKETS))
+
+
+def test_full_run(paths):
+    state = CheckpointedJob(*paths, every=10).run()
+    with open(paths[1], encoding='utf-8') as output:
+        assert output.read() == expected_output()
+    assert (state.packets, state.errors) == (93, 1)
+    assert state.totals['Running'].sessions == 31
+    assert load_checkpoint(paths[2]) == state
+
+
+def test_resume_after_crash_writes_each_message_once(paths, monkeypatch):
+    save = checkpoint.save_checkpoint
+    calls = []
+
+    def crash_on_fourth(path, state):
+        calls.append(state.packets)
+        if len(calls) == 4:
+            raise KeyboardInterrupt
+        save(path, state)
+
+    monkeypatch.setattr(checkpoint, 'save_checkpoint', crash_on_fourth)
+    with pytest.raises(KeyboardInterrupt):
+        CheckpointedJob(*paths, every=10).run()
+    assert load_checkpoint(paths[2]).packets == 30
+    monkeypatch.setattr(checkpoint, 'save_checkpoint', save)
+    state = CheckpointedJob(*paths, every=10).run()
+    with open(paths[1], encoding='utf-8') as output:
+        assert output.read() == expected_output()
+    fresh = CheckpointedJob(paths[0], paths[1] + '.fresh',
+                            paths[2] + '.fresh').run()
+    assert state.totals == fresh.totals
+    assert state.packets == fresh.packets
+
+
+def test_finished_job_is_not_repeated(paths):
+    first = CheckpointedJob(*paths).run()
+    assert CheckpointedJob(*paths).run() == first
+    with open(paths[1], encoding='utf-8') as output:
+        assert output.read() == expected_output()
+
+
+def test_undecodable_line_is_an_error(paths):
+    with open(paths[0], 'ab') as source:
+        source.write(b'["RUN", [15000, 1, 75]]\xff\n')
+    state = CheckpointedJob(*paths, every=10).run()
+    assert (state.packets, state.errors) == (93, 2)
+    with open(paths[1], encoding='utf-8') as output:
+        assert output.read() == expected_output()
+
+
+def test_huge_integer_is_an_error(paths):
+    with open(paths[0], 'a') as source:
+        source.write(f'["RUN", [{10**400}, 1, 75]]\n')
+    state = CheckpointedJob(*paths, every=10).run()
+    assert (state.packets, state.errors) == (93, 2)
+
+
+def test_checkpoint_of_another_job(paths, tmp_path):
+    CheckpointedJob(*paths).run()
+    with pytest.raises(ValueError):
+        CheckpointedJob(paths[0], str(tmp_path / 'other.txt'),
+                        paths[2]).run()
+
+
+@pytest.mark.parametrize('keep', [0, 100])
+def test_missing_or_short_output(paths, keep):
+    CheckpointedJob(*paths, every=10).run()
+    with open(paths[1], 'r+b') as output:
+        output.truncate(keep)
+    if not keep:
+        os.remove(paths[1])
+    with pytest.raises(ValueError, match='короче'):
+        CheckpointedJob(*paths, every=10).run()
+
+
+def test_checkpoint_round_trip():
+    state = Checkpoint('in', 'out', 10, 20, 3, 1)
+    assert Checkpoint.from_json(state.to_json()) == state
@@ -0,0 +1,100 @@
+import io
+import json
+import sys
+
+import pytest
+
+import homework
+from binary import write_packets
+from cli import input_format, run
+from columnar import read_columns
+from conftest import SAMPLE_PACKETS, expected_messages
+
+PACKETS = SAMPLE_PACKETS * 4
+MESSAGES = [info.get_message() for info in expected_messages(PACKETS)]
+
+
+@pytest.fixture
+def jsonl_input(tmp_path):
+    path = tmp_path / 'packets.jsonl'
+    path.write_text(''.join(json.dumps({'workout_type': workout_type,
+                                        'data': data}) + '\n'
+                            for workout_type, data in PACKETS)
+                    + '{"workout_type": "BOX", "data": [1]}\n')
+    return str(path)
+
+
+def test_input_format_from_extension():
+    assert input_format('a.csv', None) == 'csv'
+    assert input_format('a.bin', None) == 'binary'
+    assert input_format('-', None) == 'jsonl'
+    assert input_format('a.csv', 'jsonl') == 'jsonl'
+
+
+@pytest.mark.parametrize('mode', ['sequential', 'threaded', 'process'])
+def test_text_output_in_every_mode(jsonl_input, tmp_path, capsys, mode):
+    output = tmp_path / 'out.txt'
+    assert run(['process', jsonl_input, '-o', str(output), '--mode', mode,
+                '--workers', '1', '--chunk-size', '5']) == 0
+    assert output.read_text(encoding='utf-8').splitlines() == MESSAGES
+    assert 'ошибок: 1' in capsys.readouterr().err
+
+
+def test_background_writer(jsonl_input, tmp_path):
+    output = tmp_path / 'out.txt'
+    run(['process', jsonl_input, '-o', str(output), '--background-writer'])
+    assert output.read_text(encoding='utf-8').splitlines() == MESSAGES
+
+
+def test_csv_to_jsonl(tmp_path):
+    source = tmp_path / 'packets.csv'
+    source.write_text(''.join(','.join([workout_type, *map(str, data)]) + '\n'
+                              for workout_type, data in PACKETS))
+    output = tmp_path / 'out.jsonl'
+    run(['process', str(source), '-o', str(output),
+         '--output-format', 'jsonl'])
+    rows = [json.loads(line) for line in
+            output.read_text(encoding='utf-8').splitlines()]
+    assert [row['training_type'] for row in rows] == [
+        'Swimming', 'Running', 'SportsWalking'] * 4
+    assert rows[1]['calories'] == pytest.approx(
+        homework.read_package(*PACKETS[1]).get_spent_calories())
+
+
+def test_binary_to_columnar(tmp_path):
+    source = tmp_path / 'packets.bin'
+    with open(source, 'wb') as file:
+        write_packets(file, PACKETS)
+    output = tmp_path / 'out.col'
+    run(['process', str(source), '-o', str(output),
+         '--output-format', 'columnar', '--mode', 'threaded'])
+    columns = read_columns(output.read_bytes())
+    assert columns['type_code'].tolist() == [0, 1, 2] * 4
+    assert columns['distance'].tolist() == pytest.approx(
+        [homework.read_package(*packet).get_distance() for packet in PACKETS])
+
+
+def test_only_errors_fail(tmp_path):
+    source = tmp_path / 'bad.jsonl'
+    source.write_text('{"workout_type": "BOX", "data": [1]}\n')
+    assert run(['process', str(source), '-o', str(tmp_path / 'out')]) == 1
+
+
+def test_binary_stdin(tmp_path, monkeypatch):
+    data = io.BytesIO()
+    write_packets(data, PACKETS)
+    data.seek(0)
+    monkeypatch.setattr(sys, 'stdin', io.TextIOWrapper(data))
+    output = tmp_path / 'out.txt'
+    assert run(['process', '-', '--format', 'binary', '-o',
+                str(output)]) == 0
+    assert output.read_text(encoding='utf-8').splitlines() == MESSAGES
+
+
+@pytest.mark.parametrize('option', ['--chunk-size', '--workers',
+                                    '--buffer-size'])
+def test_sizes_must_be_positive(jsonl_input, option, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        run(['process', jsonl_input, option, '0'])
+    assert exit_info.value.code == 2
+    assert 'больше 0' in capsys.readouterr().err
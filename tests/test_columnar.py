@@ -0,0 +1,71 @@
+import io
+
+import numpy as np
+import pytest
+
+import columnar
+import homework
+from batch import Columns, compute_batch
+from columnar import ColumnarSink, read_columns, read_row_groups
+from conftest import SAMPLE_PACKETS, expected_messages
+
+PACKETS = SAMPLE_PACKETS * 3
+
+
+def write(packets, row_group):
+    output = io.BytesIO()
+    with ColumnarSink(output, row_group=row_group) as sink:
+        for workout_type, data in packets:
+            info = homework.read_package(workout_type, data)
+            sink.add(workout_type, data, info.show_training_info())
+    return output.getvalue()
+
+
+def test_round_trip_in_row_groups():
+    data = write(PACKETS, row_group=4)
+    assert [len(group['type_code'])
+            for group in read_row_groups(data)] == [4, 4, 1]
+    columns = read_columns(data)
+    assert columns['calories'].tolist() == [
+        info.calories for info in expected_messages(PACKETS)]
+    assert columns['height'].tolist() == [0, 0, 180] * 3
+    assert columns['count_pool'].tolist() == [40, 0, 0] * 3
+    assert columns['type_code'].tolist() == [0, 1, 2] * 3
+
+
+def test_add_batch_matches_add():
+    columns = Columns(*(np.array(column, dtype=float) for column in (
+        [720, 15000, 9000], [1, 1, 1.5], [80, 75, 75], [0, 0, 180],
+        [25, 0, 0], [40, 0, 0])))
+    metrics = compute_batch([0, 1, 2], *columns)
+    output = io.BytesIO()
+    with ColumnarSink(output) as sink:
+        sink.add_batch(columns, metrics)
+    expected = read_columns(write(PACKETS[:3], row_group=10))
+    result = read_columns(output.getvalue())
+    for name, column in expected.items():
+        assert np.array_equal(result[name], column), name
+
+
+def test_add_batch_with_string_codes():
+    columns = Columns(*(np.array(column, dtype=float) for column in (
+        [720, 15000], [1, 1], [80, 75], [0, 0], [25, 0], [40, 0])))
+    metrics = compute_batch(['SWM', 'RUN'], *columns)
+    assert metrics.type_code.tolist() == [0, 1]
+    output = io.BytesIO()
+    with ColumnarSink(output) as sink:
+        sink.add_batch(columns, metrics._replace(
+            type_code=np.array(['SWM', 'RUN'])))
+    assert read_columns(output.getvalue())['type_code'].tolist() == [0, 1]
+
+
+def test_reader_rejects_foreign_files():
+    with pytest.raises(ValueError):
+        list(read_row_groups(b'not a session file'))
+
+
+@pytest.mark.skipif(columnar.pyarrow is not None,
+                    reason='pyarrow установлен')
+def test_parquet_requires_pyarrow(tmp_path):
+    with pytest.raises(ImportError):
+        columnar.ParquetSink(str(tmp_path / 'sessions.parquet'))
@@ -0,0 +1,44 @@
+from dataclasses import astuple
+
+import pytest
+
+import compact
+import homework
+from conftest import SAMPLE_PACKETS as PACKETS, expected_messages
+
+
+@pytest.mark.parametrize('packet', PACKETS)
+def test_slotted_training_matches_homework(packet):
+    training = compact.read_package(*packet)
+    assert not hasattr(training, '__dict__')
+    expected = homework.read_package(*packet).show_training_info()
+    info = training.show_training_info()
+    assert not hasattr(info, '__dict__')
+    assert astuple(info) == astuple(expected)
+    assert info.get_message() == expected.get_message()
+
+
+def test_slotted_training_wrong_arity():
+    with pytest.raises(TypeError):
+        compact.read_package('RUN', [15000, 1])
+    with pytest.raises(NotImplementedError):
+        compact.read_package('BOX', [15000, 1, 75])
+
+
+def test_training_batch_materializes_messages():
+    batch = compact.TrainingBatch(PACKETS)
+    assert len(batch) == 3
+    for info, expected in zip(batch, expected_messages(PACKETS)):
+        assert astuple(info) == astuple(expected)
+    batch.append('RUN', [1206, 12, 6])
+    assert batch[-1].get_message() == (
+        homework.Running(1206, 12, 6).show_training_info().get_message())
+
+
+def test_training_batch_validates_packets():
+    batch = compact.TrainingBatch()
+    with pytest.raises(TypeError):
+        batch.append('SWM', [720, 1, 80])
+    with pytest.raises(NotImplementedError):
+        batch.append('BOX', [1, 1, 1])
+    assert len(batch) == 0
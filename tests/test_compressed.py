@@ -0,0 +1,92 @@
+import gzip
+import re
+import json
+
+import pytest
+
+import compressed
+from cli import input_format, run
+from compressed import (detect_compression, iter_decompressed, open_input,
+                        read_compressed, write_compressed)
+from conftest import SAMPLE_PACKETS
+
+# Lists, as the packets come back from JSON.
+PACKETS = [list(packet) for packet in SAMPLE_PACKETS] * 200
+LINES = [json.dumps(packet) + '\n' for packet in PACKETS]
+
+
+def packets(chunks):
+    return [[workout_type, data] for chunk in chunks
+            for workout_type, data in chunk]
+
+
+@pytest.mark.parametrize('compression', ['gzip', 'bz2', 'xz'])
+def test_parallel_read_in_order(tmp_path, compression):
+    path = str(tmp_path / 'packets')
+    write_compressed(path, LINES, compression, member_bytes=1000)
+    assert compressed.file_compression(path) == compression
+    chunks = list(read_compressed(path, workers=3, chunk_bytes=300))
+    assert len(chunks) > 1
+    assert packets(chunks) == PACKETS
+    with open_input(path) as source:
+        assert source.readlines() == LINES
+
+
+def test_false_member_signature_is_merged(tmp_path, monkeypatch):
+    path = str(tmp_path / 'packets.gz')
+    write_compressed(path, LINES, member_bytes=5000)
+    # Pretend every byte may start a member: most ranges end mid-member.
+    codec = compressed.CODECS['gzip']
+    monkeypatch.setitem(compressed.CODECS, 'gzip', codec._replace(
+        member=re.compile(rb'(?s).')))
+    with open(path, 'rb') as file:
+        expected = gzip.decompress(file.read())
+    assert b''.join(iter_decompressed(path, workers=2,
+                                      chunk_bytes=700)) == expected
+
+
+def test_single_member_and_truncated_file(tmp_path):
+    path = tmp_path / 'packets.gz'
+    data = gzip.compress(''.join(LINES).encode())
+    path.write_bytes(data)
+    assert packets(read_compressed(str(path))) == PACKETS
+    path.write_bytes(data[:-20])
+    with pytest.raises(EOFError):
+        list(read_compressed(str(path)))
+
+
+@pytest.mark.parametrize('compression', ['gzip', 'bz2', 'xz'])
+def test_single_member_is_streamed_in_pieces(tmp_path, monkeypatch,
+                                             compression):
+    path = str(tmp_path / 'packets')
+    write_compressed(path, LINES, compression, member_bytes=10**9)
+    monkeypatch.setattr(compressed, 'PIECE_BYTES', 1000)
+    blocks = list(iter_decompressed(path, workers=2, chunk_bytes=100))
+    assert max(map(len, blocks)) <= 1000
+    assert b''.join(blocks) == ''.join(LINES).encode()
+
+
+def test_undecodable_line_goes_to_errors(tmp_path):
+    path = tmp_path / 'packets.gz'
+    bad = b'["RUN", [1, 1, 1]]\xff'
+    path.write_bytes(gzip.compress(
+        b''.join([LINES[0].encode(), bad + b'\n', LINES[1].encode()])))
+    errors = []
+    chunks = read_compressed(str(path),
+                             errors=lambda line, error: errors.append(line))
+    assert packets(chunks) == PACKETS[:2]
+    assert errors == [bad]
+
+
+def test_detect_compression():
+    assert detect_compression(gzip.compress(b'x')) == 'gzip'
+    assert detect_compression(b'{"workout_type"') is None
+
+
+def test_cli_reads_compressed_csv(tmp_path):
+    path = str(tmp_path / 'packets.csv.gz')
+    write_compressed(path, ['RUN,15000,1,75\n'] * 10, member_bytes=50)
+    assert input_format(path, None) == 'csv'
+    output = tmp_path / 'out.jsonl'
+    run(['process', path, '-o', str(output), '--output-format', 'jsonl'])
+    assert len(output.read_text(encoding='utf-8').splitlines()) == 10
@@ -0,0 +1,89 @@
+import pytest
+
+from dedup import BloomFilter, DuplicateFilter, packet_key
+
+PACKET = ('RUN', [15000, 1, 75])
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def keys(count, prefix='device'):
+    return [packet_key(f'{prefix}-{number}', 1, 'RUN', [number, 1, 75])
+            for number in range(count)]
+
+
+def test_key_ignores_number_types():
+    assert packet_key(1, 2, 'RUN', [15000, 1, 75]) == packet_key(
+        1, 2, 'RUN', [15000.0, 1.0, 75.0])
+    assert packet_key(1, 2, 'RUN', [15000, 1, 75]) != packet_key(
+        1, 3, 'RUN', [15000, 1, 75])
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(bits=8192, hashes=4)
+    added = keys(500)
+    for key in added:
+        bloom.add(key)
+    assert all(key in bloom for key in added)
+    assert 0 < bloom.false_positive_rate() < 0.1
+
+
+def test_retries_are_dropped():
+    dedup = DuplicateFilter(memory=2**16, capacity=1000, clock=Clock())
+    events = [('watch', 7, PACKET), ('watch', 7, PACKET),
+              ('watch', 8, PACKET), ('watch', 7, ('RUN', [15000, 1.0, 75]))]
+    assert list(dedup.filter(events)) == [PACKET, PACKET]
+    assert dedup.stats()['duplicates'] == 2
+
+
+def test_measured_false_positive_rate_matches_estimate():
+    dedup = DuplicateFilter(memory=2**16, capacity=20_000, clock=Clock())
+    for key in keys(20_000):
+        dedup.seen(key)
+    estimate = dedup.false_positive_rate()
+    fresh = keys(2000, prefix='other')
+    measured = sum(dedup.seen(key) for key in fresh) / len(fresh)
+    assert measured < 0.05
+    assert measured == pytest.approx(estimate, abs=0.01)
+
+
+def test_rotation_forgets_after_window():
+    clock = Clock()
+    dedup = DuplicateFilter(memory=2**14, capacity=100, window=60,
+                            clock=clock)
+    key = keys(1)[0]
+    assert not dedup.seen(key)
+    clock.now += 90
+    assert dedup.seen(key)  # Still inside the previous generation
+    clock.now += 200
+    assert not dedup.seen(key)
+    assert dedup.memory == 2**14
+
+
+def test_snapshot_keeps_seen_packets(tmp_path):
+    clock = Clock()
+    path = str(tmp_path / 'dedup.bin')
+    dedup = DuplicateFilter(memory=2**14, capacity=100, window=60,
+                            clock=clock)
+    added = keys(50)
+    for key in added:
+        dedup.seen(key)
+    dedup.save(path)
+    restored = DuplicateFilter.load(path, clock=clock)
+    assert restored.stats()['items'] == 50
+    assert all(restored.seen(key) for key in added)
+    clock.now += 500
+    assert not DuplicateFilter.load(path, clock=clock).seen(added[0])
+
+
+def test_load_rejects_foreign_file(tmp_path):
+    path = tmp_path / 'other.bin'
+    path.write_bytes(b'something else')
+    with pytest.raises(ValueError):
+        DuplicateFilter.load(str(path))
@@ -0,0 +1,30 @@
+import pytest
+
+import homework
+from conftest import make_packets
+from dispatch import compile_generic, compile_table, compute_package
+
+
+def test_compute_package_matches_classes():
+    for workout_type, data in make_packets(3000):
+        expected = homework.read_package(workout_type, data)
+        assert (compute_package(workout_type, data)
+                == expected.show_training_info())
+
+
+def test_compute_package_errors():
+    with pytest.raises(NotImplementedError):
+        compute_package('BOX', [1, 1, 1])
+    with pytest.raises(TypeError, match='Running'):
+        compute_package('RUN', [15000, 1])
+    with pytest.raises(TypeError, match='Swimming'):
+        compute_package('SWM', [720, 1, 80, 25, 40, 1])
+
+
+def test_generic_compiler_for_unknown_classes():
+    class Rowing(homework.Running):
+        pass
+
+    table = compile_table({'ROW': Rowing})
+    assert table['ROW'](15000, 1, 75).training_type == 'Rowing'
+    assert compile_generic(Rowing).__name__ == 'Rowing'
@@ -0,0 +1,46 @@
+import homework
+import stream
+from conftest import SAMPLE_PACKETS
+from instrumentation import Instrumentation
+
+PACKETS = SAMPLE_PACKETS + [('RUN', [9000, 1, 75])]
+
+
+def test_stages_are_counted_per_workout_type():
+    read_package = homework.read_package
+    with Instrumentation() as instrumentation:
+        assert stream.read_package is not read_package
+        for info in stream.process(PACKETS):
+            info.get_message()
+    assert stream.read_package is read_package
+    assert homework.read_package is read_package
+    assert '__init__' not in vars(homework.Running)
+    stages = instrumentation.stages
+    assert stages['read_package', 'Running'].count == 2
+    assert stages['__init__', 'SportsWalking'].count == 1
+    assert stages['show_training_info', 'Swimming'].count == 1
+    assert stages['get_message', 'Running'].count == 2
+    assert stages['get_spent_calories', 'Running'].count == 2
+
+
+def test_exports(tmp_path):
+    with Instrumentation() as instrumentation:
+        homework.read_package('RUN', [15000, 1, 75]).show_training_info()
+    assert 'read_package' in instrumentation.snapshot()
+    path = tmp_path / 'training.prom'
+    instrumentation.write_prometheus(str(path))
+    text = path.read_text()
+    assert ('training_stage_seconds_count{stage="read_package",'
+            'workout="Running"} 1') in text
+    assert ('training_stage_seconds_bucket{stage="read_package",'
+            'workout="Running",le="+Inf"} 1') in text
+
+
+def test_capture_window(tmp_path):
+    path = str(tmp_path / 'window')
+    with Instrumentation() as instrumentation:
+        instrumentation.capture(2, path)
+        for packet in PACKETS:
+            homework.read_package(*packet)
+    assert (tmp_path / 'window.prof').exists()
+    assert (tmp_path / 'window.mem.txt').exists()
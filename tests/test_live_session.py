@@ -0,0 +1,51 @@
+import pytest
+
+import homework
+from live_session import SwimmingSession
+
+
+def expected(action, duration, count_pool):
+    return homework.Swimming(action, duration, 80, 25,
+                             count_pool).show_training_info()
+
+
+def test_increments_match_full_recompute():
+    session = SwimmingSession(weight=80, length_pool=25, threshold=0)
+    for _ in range(120):
+        session.update(action=6, duration=0.5 / 60, count_pool=0)
+        session.update(count_pool=1)
+    info = session.snapshot()
+    reference = expected(720, 1, 120)
+    assert info.training_type == 'Swimming'
+    for field in ('duration', 'distance', 'speed', 'calories'):
+        assert getattr(info, field) == pytest.approx(
+            getattr(reference, field))
+
+
+def test_cumulative_totals():
+    session = SwimmingSession(weight=80, length_pool=25)
+    for minute in range(1, 61):
+        session.update_totals(12 * minute, minute / 60, minute // 2)
+    reference = expected(720, 1, 30)
+    assert session.snapshot().calories == pytest.approx(reference.calories)
+    assert session.action == 720
+
+
+def test_snapshots_only_past_threshold():
+    session = SwimmingSession(weight=80, length_pool=25, threshold=0.05)
+    assert session.update(action=100, duration=0.1, count_pool=4)
+    emitted = [session.update(action=1, duration=0.001)
+               for _ in range(20)]
+    snapshots = [info for info in emitted if info is not None]
+    assert 0 < len(snapshots) < 5
+    assert session.update() is None
+    last = session.snapshot()
+    assert last is session.last
+    assert last.distance == pytest.approx(120 * 1.38 / 1000)
+
+
+def test_empty_session_has_zero_speed():
+    session = SwimmingSession(weight=80, length_pool=25)
+    assert session.speed == 0.0
+    assert session.snapshot().get_message().startswith(
+        'Тип тренировки: Swimming')
@@ -0,0 +1,81 @@
+import pytest
+
+import homework
+
+
+def test_metrics_are_computed_once(monkeypatch):
+    calls = []
+    get_distance = homework.Training.get_distance
+
+    def counting_get_distance(self):
+        calls.append(self)
+        return get_distance(self)
+
+    monkeypatch.setattr(homework.Running, 'get_distance',
+                        counting_get_distance)
+    running = homework.Running(15000, 1, 75)
+    running.compute_all()
+    assert len(calls) == 1
+    running.compute_all()
+    assert len(calls) == 2
+    assert vars(running) == {'action': 15000, 'duration': 1, 'weight': 75}
+
+
+def test_property_setters_of_subclasses():
+    class Rowing(homework.Running):
+        @property
+        def weight(self):
+            return self._weight
+
+        @weight.setter
+        def weight(self, value):
+            self._weight = value
+
+    rowing = Rowing(15000, 1, 75)
+    assert rowing.weight == 75
+    assert rowing.compute_all() == homework.Running(15000, 1,
+                                                    75).compute_all()
+
+
+@pytest.mark.parametrize('packet, field, value', [
+    (('RUN', [15000, 1, 75]), 'action', 9000),
+    (('RUN', [15000, 1, 75]), 'duration', 2),
+    (('WLK', [9000, 1, 75, 180]), 'weight', 80),
+    (('WLK', [9000, 1, 75, 180]), 'height', 170),
+    (('SWM', [720, 1, 80, 25, 40]), 'length_pool', 50),
+    (('SWM', [720, 1, 80, 25, 40]), 'count_pool', 20),
+])
+def test_compute_all_sees_field_change(packet, field, value):
+    training = homework.read_package(*packet)
+    training.compute_all()
+    setattr(training, field, value)
+    data = dict(vars(homework.read_package(*packet)), **{field: value})
+    expected = homework.CLASSES[packet[0]](**data).compute_all()
+    assert training.compute_all() == expected
+
+
+def test_compute_all_uses_overridden_methods():
+    class Treadmill(homework.Running):
+        def get_mean_speed(self):
+            return 12.0
+
+    class Stairs(homework.SportsWalking):
+        def get_spent_calories(self):
+            return self.get_mean_speed() * 2
+
+    treadmill = Treadmill(15000, 1, 75)
+    assert treadmill.compute_all() == (
+        treadmill.get_distance(), 12.0, treadmill.get_spent_calories())
+    stairs = Stairs(9000, 1, 75, 180)
+    assert stairs.compute_all() == (
+        stairs.get_distance(), stairs.get_mean_speed(),
+        stairs.get_mean_speed() * 2)
+
+
+def test_compute_all_matches_show_training_info():
+    for packet in [('SWM', [720, 1, 80, 25, 40]), ('RUN', [15000, 1, 75]),
+                   ('WLK', [9000, 1, 75, 180])]:
+        training = homework.read_package(*packet)
+        metrics = training.compute_all()
+        info = training.show_training_info()
+        assert metrics == (info.distance, info.speed, info.calories)
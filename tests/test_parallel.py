@@ -0,0 +1,26 @@
+import homework
+from conftest import SAMPLE_PACKETS, expected_messages
+from parallel import chunked, process_parallel
+from stream import BoundedErrorSink
+
+PACKETS = (SAMPLE_PACKETS + [('BOX', [1, 1, 1])]) * 5
+
+
+def test_chunked():
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+
+def test_process_parallel_keeps_order():
+    errors = BoundedErrorSink()
+    result = list(process_parallel(PACKETS, workers=2, chunk_size=3,
+                                   errors=errors))
+    assert result == expected_messages(PACKETS)
+    assert errors.count == 5
+
+
+def test_process_parallel_unordered():
+    result = process_parallel(PACKETS, workers=2, chunk_size=3,
+                              ordered=False, errors=BoundedErrorSink())
+    key = homework.InfoMessage.get_message
+    expected = expected_messages(PACKETS)
+    assert sorted(result, key=key) == sorted(expected, key=key)
@@ -0,0 +1,55 @@
+import io
+
+import numpy as np
+import pytest
+
+from batch import compute_batch
+from columnar import ColumnarSink, float_dtype, read_columns
+from precision import (compare_precision, message_within_tolerance,
+                       realistic_columns)
+
+
+@pytest.mark.parametrize('seed', [0, 1])
+def test_float32_within_documented_tolerance(seed):
+    report = compare_precision(*realistic_columns(50_000, seed))
+    assert report.within_tolerance
+    assert report.message_violations == 0
+    assert max(report.max_relative_error.values()) < 1e-6
+
+
+def test_message_tolerance():
+    expected = 'Дистанция: 9.750 км; Потрачено ккал: 797.805.'
+    assert message_within_tolerance(
+        'Дистанция: 9.751 км; Потрачено ккал: 797.805.', expected)
+    assert not message_within_tolerance(
+        'Дистанция: 9.753 км; Потрачено ккал: 797.805.', expected)
+
+
+def test_float32_batch_keeps_dtype():
+    codes, columns = realistic_columns(100)
+    metrics = compute_batch(codes, *columns, dtype=np.float32)
+    assert metrics.calories.dtype == np.float32
+    assert metrics.distance.nbytes == 400
+
+
+@pytest.mark.parametrize('rows', [1, 5, 9])
+def test_float32_columnar_round_trip(rows):
+    codes, columns = realistic_columns(rows)
+    metrics = compute_batch(codes, *columns, dtype=np.float32)
+    output = io.BytesIO()
+    with ColumnarSink(output, row_group=4, dtype=np.float32) as sink:
+        sink.add_batch(columns, metrics)
+        sink.add('RUN', [15000, 1, 75],
+                 next(compute_batch(['RUN'], [15000], [1], [75]).messages()))
+    data = output.getvalue()
+    assert float_dtype(data) == np.float32
+    restored = read_columns(data)
+    assert restored['calories'].dtype == np.float32
+    assert restored['calories'][:rows].tolist() == metrics.calories.tolist()
+    assert restored['type_code'].tolist() == [*codes.tolist(), 1]
+    assert restored['weight'][-1] == 75
+
+
+def test_rejects_other_dtypes():
+    with pytest.raises(ValueError):
+        ColumnarSink(io.BytesIO(), dtype=np.float16)
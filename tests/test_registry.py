@@ -0,0 +1,144 @@
+import io
+import json
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+import batch
+import homework
+from binary import write_packets
+from cli import run
+from columnar import ColumnarSink, read_columns
+from compact import TrainingBatch
+from registry import Registry
+
+PLUGIN = '''from homework import Training
+
+
+class Cycling(Training):
+    """Тренировка: велосипед."""
+
+    LEN_STEP = 5.5
+
+    def get_spent_calories(self):
+        return self.get_mean_speed() * self.weight
+
+
+def kernel(cls, cols):
+    distance = cols.action * cls.LEN_STEP / cls.M_IN_KM
+    speed = distance / cols.duration
+    return distance, speed, speed * cols.weight
+
+
+TRAINING = Cycling
+BATCH_KERNEL = kernel
+'''
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    (tmp_path / 'cyc.py').write_text(PLUGIN)
+    (tmp_path / 'row.py').write_text(PLUGIN.replace('Cycling', 'Rowing')
+                                     .replace('BATCH_KERNEL = kernel', ''))
+    registry = Registry(homework.CLASSES, plugin_dirs=[str(tmp_path)])
+    registry._discovery.pop()  # Installed packages are not scanned here
+    monkeypatch.setattr(homework, 'CLASSES', registry)
+    monkeypatch.setattr(batch, 'CLASSES', registry)
+    yield registry
+    for name in ('training_plugins.cyc', 'training_plugins.row',
+                 'training_plugins.slw'):
+        sys.modules.pop(name, None)
+
+
+def test_plugin_is_imported_on_first_use(registry):
+    assert 'training_plugins.cyc' not in sys.modules
+    training = homework.read_package('CYC', [1000, 1, 70])
+    assert 'training_plugins.cyc' in sys.modules
+    assert 'training_plugins.row' not in sys.modules
+    info = training.show_training_info()
+    assert info.training_type == 'Cycling'
+    assert info.distance == 5.5
+    assert 'CYC' in registry and 'CYC' not in registry.sources
+
+
+def test_concurrent_first_use(registry, tmp_path):
+    (tmp_path / 'slw.py').write_text(
+        'import time\n' + PLUGIN.replace('Cycling', 'Slow')
+        + 'time.sleep(0.05)\n')
+    barrier = threading.Barrier(4)
+
+    def first_use(_):
+        barrier.wait()
+        return homework.read_package('SLW', [1000, 1, 70])
+
+    with ThreadPoolExecutor(4) as executor:
+        trainings = list(executor.map(first_use, range(4)))
+    assert {type(training).__name__ for training in trainings} == {'Slow'}
+    assert len({type(training) for training in trainings}) == 1
+
+
+def test_unknown_code(registry):
+    with pytest.raises(NotImplementedError):
+        homework.read_package('BOX', [1, 1, 1])
+    assert 'BOX' not in registry
+    assert registry.get('BOX') is None
+
+
+def test_membership_loads_plugins(registry):
+    assert 'CYC' in registry
+    assert registry.get('ROW').__name__ == 'Rowing'
+    assert registry.get('RUN') is homework.Running
+
+
+def test_plugin_batch_kernels(registry):
+    metrics = batch.compute_batch(['CYC', 'ROW', 'RUN'], [1000, 1000, 15000],
+                                  [1, 2, 1], [70, 80, 75])
+    expected = [homework.read_package(code, data).show_training_info()
+                for code, data in [('CYC', [1000, 1, 70]),
+                                   ('ROW', [1000, 2, 80]),
+                                   ('RUN', [15000, 1, 75])]]
+    assert list(metrics.messages()) == expected
+    assert registry.kernels.keys() == {registry['CYC']}
+    assert isinstance(metrics.calories, np.ndarray)
+
+
+def test_scalar_kernel_rejects_unknown_fields():
+    class Cycling(homework.Training):
+        def __init__(self, action, duration, weight, cadence):
+            super().__init__(action, duration, weight)
+            self.cadence = cadence
+
+    cols = batch.Columns(*(np.ones(2) for _ in batch.Columns._fields))
+    with pytest.raises(NotImplementedError, match='cadence'):
+        batch.scalar_kernel(Cycling, cols)
+
+
+def test_load_all(registry):
+    registry.load_all()
+    assert {'CYC', 'ROW'} <= registry.keys()
+    assert not registry.sources
+
+
+def test_fixed_layouts_reject_plugin_codes(registry):
+    info = homework.read_package('CYC', [1000, 1, 70]).show_training_info()
+    with pytest.raises(NotImplementedError, match='CYC'):
+        write_packets(io.BytesIO(), [('CYC', [1000, 1, 70])])
+    with pytest.raises(NotImplementedError, match='CYC'):
+        ColumnarSink(io.BytesIO()).add('CYC', [1000, 1, 70], info)
+    with pytest.raises(NotImplementedError, match='CYC'):
+        TrainingBatch([('CYC', [1000, 1, 70])])
+
+
+def test_columnar_output_sends_plugin_codes_to_errors(registry, tmp_path,
+                                                      capsys):
+    source = tmp_path / 'plug.jsonl'
+    source.write_text(''.join(json.dumps(packet) + '\n' for packet in [
+        ['CYC', [1000, 1, 70]], ['RUN', [15000, 1, 75]]]))
+    output = tmp_path / 'out.col'
+    assert run(['process', str(source), '-o', str(output),
+                '--output-format', 'columnar']) == 0
+    assert read_columns(output.read_bytes())['type_code'].tolist() == [1]
+    assert 'Обработано: 1, ошибок: 1' in capsys.readouterr().err
@@ -0,0 +1,48 @@
+import io
+import random
+from dataclasses import asdict, dataclass
+
+import pytest
+
+import homework
+
+
+def make_messages(size, seed=0):
+    rnd = random.Random(seed)
+    return [homework.InfoMessage(rnd.choice(list(homework.CLASSES)),
+                                 rnd.choice([1, 2.5, rnd.uniform(0, 10)]),
+                                 rnd.uniform(0, 50), rnd.uniform(-1, 30),
+                                 rnd.uniform(0, 5000))
+            for _ in range(size)]
+
+
+def test_get_message_matches_format_template():
+    for info in make_messages(1000):
+        expected = info.MESSAGE.format(**asdict(info))
+        assert info.get_message() == expected
+
+
+def test_render_messages_to_string_and_stream():
+    messages = make_messages(2500)
+    expected = ''.join(info.get_message() + '\n' for info in messages)
+    assert homework.render_messages(messages) == expected
+    output = io.StringIO()
+    assert homework.render_messages(iter(messages), output) is None
+    assert output.getvalue() == expected
+
+
+def test_subclass_message_is_used():
+    @dataclass
+    class ShortMessage(homework.InfoMessage):
+        MESSAGE = '{training_type}: {distance:.1f} км'
+
+    info = ShortMessage('Running', 1, 9.75, 9.75, 699.75)
+    assert info.get_message() == 'Running: 9.8 км'
+    assert homework.render_messages([info, make_messages(1)[0]]) == (
+        'Running: 9.8 км\n' + make_messages(1)[0].get_message() + '\n')
+
+
+def test_compile_message_rejects_unsupported_fields():
+    assert homework.compile_message('{a} 100%')[0] == '%s 100%%'
+    with pytest.raises(ValueError):
+        homework.compile_message('{a:>10}')
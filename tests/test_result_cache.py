@@ -0,0 +1,71 @@
+import threading
+
+import pytest
+
+import homework
+from result_cache import ResultCache
+
+
+def test_hits_misses_and_eviction():
+    cache = ResultCache(maxsize=2)
+    run = cache.info('RUN', [15000, 1, 75])
+    assert run == homework.Running(15000, 1, 75).show_training_info()
+    assert cache.info('RUN', (15000.0, 1.0, 75.0)) is run
+    cache.info('WLK', [9000, 1, 75, 180])
+    cache.info('RUN', [15000, 1, 75])
+    cache.info('SWM', [720, 1, 80, 25, 40])
+    assert cache.stats() == {'hits': 2, 'misses': 3, 'evictions': 1,
+                             'size': 2}
+    cache.info('WLK', [9000, 1, 75, 180])
+    assert cache.stats()['misses'] == 4
+
+
+def test_message_is_cached():
+    cache = ResultCache()
+    message = cache.message('RUN', [15000, 1, 75])
+    assert message == (
+        homework.Running(15000, 1, 75).show_training_info().get_message())
+    assert cache.message('RUN', [15000, 1, 75]) is message
+
+
+def test_errors_are_not_cached():
+    cache = ResultCache()
+    with pytest.raises(NotImplementedError):
+        cache.info('BOX', [1, 1, 1])
+    assert len(cache) == 0
+
+
+def test_non_numeric_data_bypasses_cache():
+    cache = ResultCache()
+    cache.info('RUN', [15000, 1, 75])
+    with pytest.raises(TypeError):
+        cache.info('RUN', ['15000', '1', '75'])
+    assert cache.info('RUN', [15000, True, 75]) == (
+        homework.read_package('RUN', [15000, True, 75]).show_training_info())
+    assert cache.stats()['hits'] == 0 and len(cache) == 1
+
+
+def test_concurrent_access():
+    cache = ResultCache(maxsize=8)
+    packets = [('RUN', [1000 * index, 1, 75]) for index in range(1, 17)]
+    errors = []
+
+    def worker():
+        try:
+            for _ in range(50):
+                for packet in packets:
+                    assert cache.message(*packet) == (
+                        homework.read_package(*packet).show_training_info()
+                        .get_message())
+        except AssertionError as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    stats = cache.stats()
+    assert stats['hits'] + stats['misses'] == 4 * 50 * 16
+    assert stats['size'] <= 8
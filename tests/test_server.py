@@ -0,0 +1,62 @@
+import asyncio
+import json
+
+import homework
+import server
+from conftest import SAMPLE_PACKETS as PACKETS, expected_messages
+from server import ERROR_MESSAGE, PacketServer
+
+
+async def exchange(host, port, lines):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(b''.join(line + b'\n' for line in lines))
+    writer.write_eof()
+    answer = await reader.read()
+    writer.close()
+    await writer.wait_closed()
+    return answer.decode().splitlines()
+
+
+async def run_clients(clients, lines):
+    server = PacketServer(batch_size=4)
+    listener = await server.start('127.0.0.1', 0)
+    host, port = listener.sockets[0].getsockname()[:2]
+    try:
+        return await asyncio.gather(*(exchange(host, port, lines)
+                                      for _ in range(clients)))
+    finally:
+        await server.close()
+
+
+def test_server_answers_every_client_in_order():
+    lines = [json.dumps(packet).encode() for packet in PACKETS * 3]
+    lines.insert(2, b'["BOX", [1, 1, 1]]')
+    expected = [info.get_message()
+                for info in expected_messages(PACKETS * 3)]
+    expected.insert(2, ERROR_MESSAGE)
+    answers = asyncio.run(run_clients(5, lines))
+    assert answers == [expected] * 5
+
+
+def test_unexpected_error_does_not_stop_batcher():
+    lines = [b'["RUN", [1' + b'0' * 400 + b', 1, 75]]',
+             json.dumps(PACKETS[1]).encode()]
+    expected = homework.read_package(*PACKETS[1]).show_training_info()
+    answers = asyncio.run(asyncio.wait_for(run_clients(2, lines), 2))
+    assert answers == [[ERROR_MESSAGE, expected.get_message()]] * 2
+
+
+def test_batcher_crash_closes_connections(monkeypatch):
+    def crash(line):
+        raise RuntimeError('batcher bug')
+
+    monkeypatch.setattr(server, 'compute_line', crash)
+    reported = []
+
+    async def run():
+        asyncio.get_running_loop().set_exception_handler(
+            lambda loop, context: reported.append(context['exception']))
+        return await run_clients(1, [json.dumps(PACKETS[1]).encode()])
+
+    assert asyncio.run(asyncio.wait_for(run(), 2)) == [[]]
+    assert isinstance(reported[0], RuntimeError)
@@ -0,0 +1,88 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+import homework
+from conftest import SAMPLE_PACKETS
+from session_index import SessionIndex
+
+START = datetime(2024, 3, 1)
+PACKETS = dict(SAMPLE_PACKETS)
+
+
+def events(count, seed=1):
+    generator = random.Random(seed)
+    result = []
+    for number in range(count):
+        workout_type = generator.choice(list(PACKETS))
+        data = list(PACKETS[workout_type])
+        data[1] = generator.uniform(0.5, 2)
+        info = homework.read_package(workout_type, data).show_training_info()
+        moment = START + timedelta(hours=number)
+        result.append((workout_type, moment, info))
+    return result
+
+
+@pytest.fixture
+def sample():
+    return events(500)
+
+
+def brute_range(events, workout_type, start, end):
+    return [(moment.timestamp(), info) for code, moment, info in events
+            if code == workout_type and start <= moment < end]
+
+
+def test_range_matches_scan_with_shuffled_inserts(sample):
+    index = SessionIndex()
+    shuffled = list(sample)
+    random.Random(2).shuffle(shuffled)
+    index.extend(shuffled)
+    assert len(index) == len(sample)
+    start, end = START + timedelta(days=3), START + timedelta(days=9)
+    for workout_type in PACKETS:
+        found = [tuple(session)
+                 for session in index.range(workout_type, start, end)]
+        assert found == brute_range(sample, workout_type, start, end)
+    assert index.range('BOX') == []
+
+
+def test_top_k_and_threshold(sample):
+    index = SessionIndex()
+    index.extend(sample)
+    start, end = START, START + timedelta(days=10)
+    expected = sorted((info.calories for _, info in
+                       brute_range(sample, 'RUN', start, end)),
+                      reverse=True)[:5]
+    top = index.top_k('RUN', 5, start=start, end=end)
+    assert [session.info.calories for session in top] == expected
+    assert all(session.info.training_type == 'Running' for session in top)
+    fast = index.above('WLK', 'speed', 5.0, start, end)
+    assert [session.timestamp for session in fast] == [
+        timestamp for timestamp, info in
+        brute_range(sample, 'WLK', start, end) if info.speed > 5.0]
+
+
+def test_save_load_and_insert_after_load(sample, tmp_path):
+    path = str(tmp_path / 'sessions.idx')
+    index = SessionIndex()
+    index.extend(sample[:400])
+    index.save(path)
+    with SessionIndex.load(path) as loaded:
+        assert len(loaded) == 400
+        assert loaded.range('SWM') == index.range('SWM')
+        loaded.extend(sample[400:])
+        assert loaded.range('SWM') == [
+            (moment.timestamp(), info)
+            for code, moment, info in sample if code == 'SWM']
+        loaded.save(path)
+    with SessionIndex.load(path) as reloaded:
+        assert len(reloaded) == len(sample)
+
+
+def test_load_rejects_foreign_file(tmp_path):
+    path = tmp_path / 'other.bin'
+    path.write_bytes(b'not an index file')
+    with pytest.raises(ValueError):
+        SessionIndex.load(str(path))
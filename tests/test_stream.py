@@ -0,0 +1,67 @@
+import io
+
+import pytest
+
+import homework
+from stream import BoundedErrorSink, process, read_csv, read_jsonl
+
+
+def test_read_jsonl_accepts_pairs_and_objects():
+    source = io.StringIO(
+        '["RUN", [15000, 1, 75]]\n'
+        '\n'
+        '{"workout_type": "WLK", "data": [9000, 1, 75, 180]}\n'
+    )
+    assert list(read_jsonl(source)) == [
+        ('RUN', [15000, 1, 75]),
+        ('WLK', [9000, 1, 75, 180]),
+    ]
+
+
+def test_read_csv():
+    source = io.StringIO('SWM,720,1,80,25,40\nRUN,15000,1,75\n')
+    assert list(read_csv(source)) == [
+        ('SWM', [720.0, 1.0, 80.0, 25.0, 40.0]),
+        ('RUN', [15000.0, 1.0, 75.0]),
+    ]
+
+
+def test_process_routes_bad_packets_to_sink():
+    errors = BoundedErrorSink(limit=2)
+    source = io.StringIO(
+        'RUN,15000,1,75\n'
+        'BOX,1,1,1\n'
+        'RUN,15000,0,75\n'
+        'WLK,9000,1\n'
+        'RUN,abc,1,75\n'
+        'WLK,9000,1,75,180\n'
+    )
+    messages = list(process(read_csv(source, errors), errors))
+    assert messages == [
+        homework.read_package('RUN', [15000, 1, 75]).show_training_info(),
+        homework.read_package('WLK', [9000, 1, 75, 180]).show_training_info(),
+    ]
+    assert errors.count == 4
+    assert len(errors.samples) == 2
+
+
+def test_huge_integer_goes_to_sink():
+    errors = BoundedErrorSink()
+    source = io.StringIO(f'["RUN", [{10**400}, 1, 75]]\n'
+                         '["RUN", [15000, 1, 75]]\n')
+    messages = list(process(read_jsonl(source, errors), errors))
+    assert [info.training_type for info in messages] == ['Running']
+    assert isinstance(errors.samples[0][1], OverflowError)
+
+
+def test_process_is_lazy():
+    def packets():
+        yield 'RUN', [15000, 1, 75]
+        raise AssertionError('Прочитан лишний пакет')
+
+    assert next(process(packets())).training_type == 'Running'
+
+
+def test_process_raises_without_sink():
+    with pytest.raises(NotImplementedError):
+        list(process([('BOX', [1, 1, 1])]))
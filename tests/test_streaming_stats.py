@@ -0,0 +1,114 @@
+import random
+import statistics
+
+import pytest
+
+from homework import InfoMessage
+from streaming_stats import (Moments, QuantileSketch, StreamingStats,
+                             WINDOW)
+
+
+def running(speed, calories=None):
+    if calories is None:
+        calories = 50 * speed
+    return InfoMessage('Running', 1.0, speed, speed, calories)
+
+
+def sample(count, seed=0):
+    generator = random.Random(seed)
+    return [generator.gauss(10, 1.5) for _ in range(count)]
+
+
+def test_moments_match_statistics_and_merge():
+    values = sample(1000)
+    left, right, whole = Moments(), Moments(), Moments()
+    for value in values[:300]:
+        left.add(value)
+    for value in values[300:]:
+        right.add(value)
+    for value in values:
+        whole.add(value)
+    left.merge(right)
+    assert left.count == whole.count == 1000
+    assert left.mean == pytest.approx(statistics.fmean(values))
+    assert left.variance == pytest.approx(statistics.variance(values))
+    assert whole.variance == pytest.approx(statistics.variance(values))
+
+
+def test_sketch_quantiles_within_relative_accuracy():
+    values = sorted(sample(5000) + [0.0] * 10)
+    first, second = QuantileSketch(), QuantileSketch()
+    for index, value in enumerate(values):
+        (first if index % 2 else second).add(value)
+    first.merge(second)
+    for q in (0.01, 0.5, 0.9, 0.99):
+        exact = values[int(q * (len(values) - 1))]
+        assert first.quantile(q) == pytest.approx(exact, rel=0.011)
+    assert first.quantile(0) == 0.0
+    assert QuantileSketch().quantile(0.5) is None
+    with pytest.raises(ValueError):
+        first.merge(QuantileSketch(relative_accuracy=0.05))
+
+
+def test_flags_impossible_and_unusual_sessions():
+    stats = StreamingStats()
+    for second, speed in enumerate(sample(200)):
+        assert stats.add(second, running(speed)) == []
+    flags = stats.add(300, running(60, calories=500))
+    assert [(flag.metric, flag.reason) for flag in flags] == [
+        ('speed', 'больше предела 45')]
+    flags = stats.add(301, running(30, calories=500))
+    assert [flag.metric for flag in flags] == ['speed']
+    assert stats.add(302, running(10, calories=5000))[0].metric == (
+        'calories')
+
+
+@pytest.mark.parametrize('value', [float('inf'), float('nan')])
+def test_nonfinite_values_are_flagged_and_skipped(value):
+    stats = StreamingStats()
+    for second, speed in enumerate(sample(50)):
+        stats.add(second, running(speed))
+    flags = stats.add(60, running(value, calories=value))
+    assert [(flag.metric, flag.reason) for flag in flags] == [
+        ('speed', 'не конечное число'), ('calories', 'не конечное число')]
+    summary = stats.summary('Running')
+    assert summary.moments['speed'].count == 50
+    assert summary.sketches['speed'].count == 50
+    assert summary.sketches['speed'].nonfinite == 1
+    assert stats.mean('Running', 'speed') == pytest.approx(
+        statistics.fmean(sample(50)))
+
+
+def test_window_slides_without_keeping_sessions():
+    stats = StreamingStats(window=600, buckets=10)
+    for second in range(600):
+        stats.add(second, running(5))
+    for second in range(600, 900):
+        stats.add(second, running(15))
+    summary = stats.summary('Running')
+    assert summary.moments['speed'].count == 600
+    assert stats.mean('Running', 'speed') == pytest.approx(10)
+    assert stats.quantile('Running', 'speed', 0.9) == pytest.approx(
+        15, rel=0.01)
+    assert stats.add(100, running(5)) == []  # Older than the window
+    assert stats.summary('Running').moments['speed'].count == 600
+    assert stats.mean('Swimming', 'speed') == 0.0
+
+
+def test_merge_of_parallel_workers_equals_single_stream():
+    speeds = sample(3000, seed=3)
+    single = StreamingStats()
+    workers = [StreamingStats() for _ in range(3)]
+    for index, speed in enumerate(speeds):
+        moment = index * WINDOW / 2000
+        single.add(moment, running(speed))
+        workers[index % 3].add(moment, running(speed))
+    merged = workers[0]
+    merged.merge(workers[1])
+    merged.merge(workers[2])
+    expected = single.summary('Running')
+    actual = merged.summary('Running')
+    assert actual.moments['speed'].count == expected.moments['speed'].count
+    assert actual.moments['speed'].mean == pytest.approx(
+        expected.moments['speed'].mean)
+    assert actual.sketches['speed'].bins == expected.sketches['speed'].bins
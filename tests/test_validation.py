@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+import homework
+from validation import compute_valid, validate_packets
+
+GOOD = [('SWM', [720, 1, 80, 25, 40]),
+        ('RUN', [15000, 1, 75]),
+        ('WLK', [9000, 1.5, 75, 180])]
+BAD = [('RUN', [15000, 0, 75]),
+       ('WLK', [9000, 1, 75, 0]),
+       ('SWM', [720, 1, 80, 25]),
+       ('BOX', [1, 1, 1]),
+       ('RUN', [15000, 'fast', 75]),
+       ('RUN', [15000, float('nan'), 75]),
+       ('SWM', [720, 1, 80, -25, 40]),
+       'RUN',
+       ('RUN', [-5, 1, 9999]),
+       ('RUN', ['15000', '1', '75']),
+       ('RUN', [15000, True, 75]),
+       ('RUN', [10**400, 1, 75])]
+
+
+def test_report_lists_every_bad_row():
+    validation = validate_packets(GOOD + BAD)
+    assert validation.valid.tolist() == [True] * 3 + [False] * len(BAD)
+    rows = {error.row for error in validation.errors}
+    assert rows == set(range(3, 3 + len(BAD)))
+    fields = {(error.row, error.field) for error in validation.errors}
+    assert {(3, 'duration'), (4, 'height'), (9, 'length_pool'),
+            (11, 'action'), (11, 'weight')} <= fields
+    assert [error.row for error in validation.errors] == sorted(
+        error.row for error in validation.errors)
+
+
+def test_error_messages():
+    errors = validate_packets(BAD).errors
+    messages = {error.row: error.message for error in errors}
+    assert messages[2] == 'ожидалось полей: 5'
+    assert messages[3] == 'неизвестный код тренировки'
+    assert messages[4] == 'нечисловое значение'
+    assert messages[7] == 'пакет должен быть парой (код, данные)'
+    assert messages[0] == 'значение 0.0 вне диапазона (0, 24]'
+    assert messages[9] == messages[10] == 'нечисловое значение'
+    assert messages[11] == 'слишком большое значение'
+
+
+def test_plugin_with_unsupported_layout(monkeypatch):
+    class Cycling(homework.Training):
+        def __init__(self, action, duration, weight, cadence):
+            super().__init__(action, duration, weight)
+            self.cadence = cadence
+
+    monkeypatch.setattr('validation.CLASSES', {'CYC': Cycling})
+    errors = validate_packets([('CYC', [1000, 1, 70, 90])]).errors
+    assert [error.message for error in errors] == [
+        'неподдерживаемый формат пакета: cadence']
+
+
+def test_valid_rows_are_computed_without_errors():
+    packets = (GOOD + BAD) * 10
+    metrics, validation = compute_valid(packets)
+    good = [packet for packet, valid in zip(packets, validation.valid)
+            if valid]
+    assert len(metrics.calories) == len(good) == 30
+    expected = [homework.read_package(*packet).get_spent_calories()
+                for packet in good]
+    np.testing.assert_allclose(metrics.calories, expected)
+
+
+def test_all_invalid_batch():
+    metrics, validation = compute_valid(BAD)
+    assert not validation.valid.any()
+    assert len(metrics.distance) == 0
+
+
+@pytest.mark.parametrize('packet', GOOD)
+def test_good_packets_pass(packet):
+    assert validate_packets([packet]).errors == []
@@ -0,0 +1,75 @@
+import io
+import time
+
+import pytest
+
+import homework
+from conftest import SAMPLE_PACKETS, expected_messages
+from writer import BackgroundWriter
+
+PACKETS = SAMPLE_PACKETS * 100
+
+
+def messages():
+    return expected_messages(PACKETS)
+
+
+class RecordingOutput(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.flushes = 0
+
+    def flush(self):
+        self.flushes += 1
+        super().flush()
+
+
+class BrokenOutput(io.StringIO):
+    def write(self, text):
+        raise OSError('диск заполнен')
+
+
+def test_writes_all_messages_in_order():
+    output = RecordingOutput()
+    with BackgroundWriter(output, queue_size=2) as writer:
+        writer.write_all(messages(), batch_size=7)
+    assert output.getvalue() == homework.render_messages(messages())
+    assert writer.written == len(PACKETS)
+    assert output.flushes >= 1
+
+
+def test_flush_every_n_messages():
+    output = RecordingOutput()
+    with BackgroundWriter(output, flush_interval=None,
+                          flush_messages=30) as writer:
+        writer.write_all(messages(), batch_size=10)
+    assert output.flushes == len(PACKETS) // 30 + 1
+
+
+def test_flush_after_interval_while_idle():
+    output = RecordingOutput()
+    writer = BackgroundWriter(output, flush_interval=0.01)
+    writer.put(messages()[:3])
+    deadline = time.monotonic() + 1
+    while not output.flushes and time.monotonic() < deadline:
+        time.sleep(0.01)
+    flushed_before_close = output.flushes
+    writer.close()
+    assert flushed_before_close
+
+
+def test_write_error_reaches_producer():
+    writer = BackgroundWriter(BrokenOutput(), queue_size=1)
+    with pytest.raises(RuntimeError) as raised:
+        writer.write_all(messages(), batch_size=1)
+        writer.close()
+    assert isinstance(raised.value.__cause__, OSError)
+    with pytest.raises(RuntimeError):
+        writer.close()
+
+
+def test_put_after_close():
+    writer = BackgroundWriter(io.StringIO())
+    writer.close()
+    with pytest.raises(ValueError):
+        writer.put(messages()[:1])
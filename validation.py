@@ -0,0 +1,153 @@
+import inspect
+from collections import defaultdict
+from itertools import chain
+from typing import NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from batch import FIELD_NAMES, BatchMetrics, Columns, compute_batch
+from homework import CLASSES
+from stream import NUMERIC, Packet
+
+LIMITS: dict[str, tuple[float, float]] = {
+    'action': (0, 1e7),  # Steps or strokes
+    'duration': (0, 24),  # Hours
+    'weight': (0, 500),  # Kilograms
+    'height': (0, 300),  # Centimeters
+    'length_pool': (0, 1000),  # Meters
+    'count_pool': (0, 1e5),
+}  # Allowed values, the upper bound is inclusive
+POSITIVE: frozenset[str] = frozenset(
+    {'duration', 'weight', 'height', 'length_pool'})  # Used as divisors
+
+
+class RowError(NamedTuple):
+    """Ошибка в строке пачки: номер строки, поле и описание."""
+    row: int
+    field: Optional[str]
+    message: str
+
+
+class Validation(NamedTuple):
+    """Результат проверки пачки: столбцы, маска годных строк и ошибки."""
+    codes: np.ndarray
+    columns: Columns
+    valid: np.ndarray
+    errors: list[RowError]
+
+    def valid_rows(self) -> tuple[np.ndarray, Columns]:
+        """Вернуть коды и столбцы только годных строк."""
+        valid = self.valid
+        return self.codes[valid], Columns(*(column[valid]
+                                            for column in self.columns))
+
+
+def _layout(workout_type) -> Optional[tuple[str, ...]]:
+    """Поля пакета вида тренировки или None для неизвестного кода."""
+    names = FIELD_NAMES.get(workout_type)
+    if names is None:
+        try:
+            names = tuple(inspect.signature(CLASSES[workout_type])
+                          .parameters)
+        except (KeyError, TypeError):
+            return None
+    return names
+
+
+def _numbers(datas: list, rows: list[int], width: int,
+             errors: list[RowError]) -> tuple[list[int], np.ndarray]:
+    """Перевести данные строк в матрицу чисел, отбросив нечисловые.
+
+    Числами считаются только int и float: строки и bool read_package
+    не принимает.
+    """
+    values = chain.from_iterable(datas[row] for row in rows)
+    if NUMERIC.issuperset(map(type, values)):
+        try:
+            return rows, np.array([datas[row] for row in rows],
+                                  dtype=np.float64).reshape(len(rows), width)
+        except OverflowError:
+            pass
+    # Rare path: find the offending rows one by one.
+    good, matrix = [], []
+    for row in rows:
+        if not NUMERIC.issuperset(map(type, datas[row])):
+            errors.append(RowError(row, None, 'нечисловое значение'))
+            continue
+        try:
+            matrix.append(np.array(datas[row], dtype=np.float64))
+        except OverflowError:
+            errors.append(RowError(row, None, 'слишком большое значение'))
+        else:
+            good.append(row)
+    return good, np.array(matrix).reshape(len(good), width)
+
+
+def validate_packets(packets: Sequence[Packet]) -> Validation:
+    """Проверить пачку пакетов масками, собрав ошибки всех строк."""
+    size = len(packets)
+    errors: list[RowError] = []
+    datas: list = [()] * size
+    lengths = np.zeros(size, dtype=np.int64)
+    groups: defaultdict[object, list[int]] = defaultdict(list)
+    for row, packet in enumerate(packets):
+        try:
+            workout_type, data = packet
+            lengths[row] = len(data)
+            groups[workout_type].append(row)
+        except (TypeError, ValueError):
+            errors.append(RowError(row, None,
+                                   'пакет должен быть парой (код, данные)'))
+        else:
+            datas[row] = data
+
+    codes = np.full(size, '', dtype=object)
+    columns = Columns(*(np.zeros(size) for _ in Columns._fields))
+    parsed = np.zeros(size, dtype=bool)
+    uses = {name: np.zeros(size, dtype=bool) for name in Columns._fields}
+    for workout_type, rows in groups.items():
+        layout = _layout(workout_type)
+        if layout is None:
+            errors.extend(RowError(row, None, 'неизвестный код тренировки')
+                          for row in rows)
+            continue
+        extra = [name for name in layout if name not in Columns._fields]
+        if extra:
+            message = f'неподдерживаемый формат пакета: {", ".join(extra)}'
+            errors.extend(RowError(row, None, message) for row in rows)
+            continue
+        indexes = np.array(rows)
+        wrong = lengths[indexes] != len(layout)
+        errors.extend(RowError(row, None, f'ожидалось полей: {len(layout)}')
+                      for row in indexes[wrong].tolist())
+        rows, matrix = _numbers(datas, indexes[~wrong].tolist(), len(layout),
+                                errors)
+        codes[rows] = workout_type
+        parsed[rows] = True
+        for position, name in enumerate(layout):
+            getattr(columns, name)[rows] = matrix[:, position]
+            uses[name][rows] = True
+
+    valid = parsed.copy()
+    for name, (low, high) in LIMITS.items():
+        column = getattr(columns, name)
+        with np.errstate(invalid='ignore'):
+            above_low = column > low if name in POSITIVE else column >= low
+            bad = uses[name] & ~(above_low & (column <= high))
+        rows = np.flatnonzero(bad)
+        bound = '(' if name in POSITIVE else '['
+        errors.extend(RowError(row, name, f'значение {value} вне диапазона '
+                                          f'{bound}{low:g}, {high:g}]')
+                      for row, value in zip(rows.tolist(),
+                                            column[rows].tolist()))
+        valid &= ~bad
+    errors.sort(key=lambda error: error.row)
+    return Validation(codes.astype(str), columns, valid, errors)
+
+
+def compute_valid(packets: Sequence[Packet]
+                  ) -> tuple[BatchMetrics, Validation]:
+    """Проверить пачку и рассчитать только годные строки."""
+    validation = validate_packets(packets)
+    codes, columns = validation.valid_rows()
+    return compute_batch(codes, *columns), validation
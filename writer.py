@@ -0,0 +1,128 @@
+import queue
+import threading
+import time
+from typing import Iterable, Optional, Sequence, TextIO
+
+from homework import RENDER_CHUNK, InfoMessage, render_messages
+
+QUEUE_SIZE: int = 64  # Batches waiting for the writer thread
+FLUSH_INTERVAL: float = 0.5  # Seconds between flushes of a busy output
+POLL_INTERVAL: float = 0.1  # How often a blocked producer checks the writer
+
+_CLOSE = object()  # Tells the writer thread to stop
+
+
+class BackgroundWriter:
+    """Отрисовка и запись сообщений в отдельном потоке.
+
+    Расчёт кладёт пачки сообщений в ограниченную очередь и не ждёт
+    медленного вывода, пока очередь не заполнится. Поток записи сбрасывает
+    буфер раз в flush_interval секунд и после flush_messages сообщений
+    (None отключает правило), а также при закрытии. Ошибка записи
+    выбрасывается в потоке расчёта из put или close.
+    """
+
+    def __init__(self, output: TextIO, queue_size: int = QUEUE_SIZE,
+                 flush_interval: Optional[float] = FLUSH_INTERVAL,
+                 flush_messages: Optional[int] = None) -> None:
+        self.output = output
+        self.flush_interval = flush_interval
+        self.flush_messages = flush_messages
+        self.written = 0
+        self.error: Optional[BaseException] = None
+        self._queue: queue.Queue = queue.Queue(queue_size)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name='BackgroundWriter')
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            self._write_batches()
+        except BaseException as error:
+            self.error = error
+            # Unblock a producer waiting on the full queue.
+            while not self._queue.empty():
+                self._queue.get_nowait()
+
+    def _write_batches(self) -> None:
+        pending = 0
+        last_flush = time.monotonic()
+        while True:
+            timeout = None
+            if pending and self.flush_interval is not None:
+                timeout = max(0.0, last_flush + self.flush_interval
+                              - time.monotonic())
+            try:
+                batch = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                batch = ()
+            if batch is _CLOSE:
+                self.output.flush()
+                return
+            if batch:
+                self.output.write(render_messages(batch))
+                pending += len(batch)
+                self.written += len(batch)
+            now = time.monotonic()
+            if pending and (
+                    (self.flush_messages is not None
+                     and pending >= self.flush_messages)
+                    or (self.flush_interval is not None
+                        and now - last_flush >= self.flush_interval)):
+                self.output.flush()
+                pending = 0
+                last_flush = now
+
+    def _raise_error(self) -> None:
+        if self.error is not None:
+            raise RuntimeError('Ошибка записи сообщений.') from self.error
+
+    def put(self, messages: Sequence[InfoMessage]) -> None:
+        """Поставить пачку сообщений в очередь на запись."""
+        if self._closed:
+            raise ValueError('Запись уже закрыта.')
+        while True:
+            self._raise_error()
+            try:
+                self._queue.put(messages, timeout=POLL_INTERVAL)
+                return
+            except queue.Full:
+                continue
+
+    def write_all(self, messages: Iterable[InfoMessage],
+                  batch_size: int = RENDER_CHUNK) -> None:
+        """Разбить поток сообщений на пачки и поставить их в очередь."""
+        batch = []
+        for info in messages:
+            batch.append(info)
+            if len(batch) >= batch_size:
+                self.put(batch)
+                batch = []
+        if batch:
+            self.put(batch)
+
+    def close(self) -> None:
+        """Дописать очередь, сбросить буфер и остановить поток."""
+        if not self._closed:
+            self._closed = True
+            while self._thread.is_alive():
+                try:
+                    self._queue.put(_CLOSE, timeout=POLL_INTERVAL)
+                    break
+                except queue.Full:
+                    continue
+            self._thread.join()
+        self._raise_error()
+
+    def __enter__(self) -> 'BackgroundWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if exc_type is None:
+            self.close()
+            return
+        try:
+            self.close()
+        except RuntimeError:
+            pass  # The error from the with body is more relevant